@@ -1,54 +1,36 @@
 import sys
 import argparse
-import json
+import functools
+import logging
 import os
-import yaml
-import asyncio
+import re
 
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
-from core.dlq_handler import DLQHandler
-from mappers.base_mapper import BaseMapper
-
-# Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent))
-
-from utils.logger import setup_logger, logger
-from connectors.magento.magento_connector import MagentoConnector
-from connectors.medusa.medusa_connector import MedusaConnector
-from services.category_sync_service import CategorySyncService
-from services.product_sync_service import ProductSyncService
-from services.customer_sync_service import CustomerSyncService
-# from core.pipeline import create_pipeline, SyncPipeline
-from core.pipeline.sync_pipeline import SyncPipeline
-from core.pipeline.pipeline import create_pipeline
-from core.mapping.mapping_factory import MappingFactory
-
-
-def create_parser():
-    """Create command line argument parser"""
-    parser = argparse.ArgumentParser(
-        description='Magento to Medusa Data Sync Tool',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-            Examples:
-            %(prog)s sync categories
-            %(prog)s sync products --batch-size 50 --max-pages 10
-            %(prog)s sync all --dry-run
-            %(prog)s dlq export --entity products --format csv
-            %(prog)s pipeline run
-            %(prog)s pipeline run --async --dry-run
-            %(prog)s pipeline status
-            %(prog)s pipeline cancel --pipeline-id pipeline_20231201_123456
-            %(prog)s pipeline resume --state-file pipeline_state_20231201_123456.json
-        """
-    )
-    
-    # Main command
-    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
-    
-    # Sync command
+from typing import Dict, Any, List, TYPE_CHECKING
+from utils import json_utils
+
+# Connectors, services and the pipeline pull in the whole HTTP/mapping stack,
+# so they are imported inside the handlers that need them. This keeps
+# `--help`, `dlq`, `stats` and `config` fast.
+if TYPE_CHECKING:
+    from connectors.magento.magento_connector import MagentoConnector
+    from connectors.medusa.medusa_connector import MedusaConnector
+
+# Same logger as utils.logger; handlers are attached by setup_logger() in main()
+logger = logging.getLogger("magento_medusa_sync")
+
+
+def _sniff_subcommand(argv):
+    """Return the subcommand named in argv, or None if there isn't one"""
+    for token in argv:
+        if token.startswith('-'):
+            continue
+        return token if token in SUBPARSER_BUILDERS else None
+    return None
+
+
+def _build_sync_parser(subparsers):
     sync_parser = subparsers.add_parser('sync', help='Sync data from Magento to Medusa')
     sync_parser.add_argument('entity', choices=['all', 'categories', 'products', 'customers'],
                            help='Entity type to sync')
@@ -62,8 +44,9 @@ def create_parser():
                            help='Resume from last sync position')
     sync_parser.add_argument('--output', type=str, default='exported/sync_results.json',
                            help='Output file for sync results')
-    
-    # DLQ command
+
+
+def _build_dlq_parser(subparsers):
     dlq_parser = subparsers.add_parser('dlq', help='Manage Dead Letter Queue')
     dlq_parser.add_argument('action', choices=['list', 'export', 'retry', 'clear'],
                           help='DLQ action to perform')
@@ -73,27 +56,31 @@ def create_parser():
                           help='Export format (default: json)')
     dlq_parser.add_argument('--output', type=str,
                           help='Output file for export')
-    
-    # Stats command
+
+
+def _build_stats_parser(subparsers):
     stats_parser = subparsers.add_parser('stats', help='View sync statistics')
     stats_parser.add_argument('--entity', choices=['all', 'products', 'categories', 'customers'],
                             help='Entity type (default: all)')
     stats_parser.add_argument('--format', choices=['table', 'json', 'csv'], default='table',
                             help='Output format (default: table)')
-    
-    # Config command
+
+
+def _build_config_parser(subparsers):
     config_parser = subparsers.add_parser('config', help='Manage configuration')
     config_parser.add_argument('action', choices=['validate', 'test', 'generate'],
                              help='Configuration action')
     config_parser.add_argument('--mapping', type=str,
                              help='Mapping file to validate/generate')
-    
-    # Test command
+
+
+def _build_test_parser(subparsers):
     test_parser = subparsers.add_parser('test', help='Test connections')
     test_parser.add_argument('--system', choices=['both', 'magento', 'medusa'], default='both',
                            help='System to test (default: both)')
-    
-    # Pipeline command
+
+
+def _build_pipeline_parser(subparsers):
     pipeline_parser = subparsers.add_parser('pipeline', help='Pipeline management')
     pipeline_subparsers = pipeline_parser.add_subparsers(dest='pipeline_action', 
                                                        help='Pipeline action', required=True)
@@ -125,13 +112,62 @@ def create_parser():
                              help='State file to resume from')
     resume_parser.add_argument('--dry-run', action='store_true',
                              help='Test run without making changes')
+
+
+SUBPARSER_BUILDERS = {
+    'sync': _build_sync_parser,
+    'dlq': _build_dlq_parser,
+    'stats': _build_stats_parser,
+    'config': _build_config_parser,
+    'test': _build_test_parser,
+    'pipeline': _build_pipeline_parser,
+}
+
+
+@functools.lru_cache(maxsize=8)
+def create_parser(only: str = None):
+    """
+    Create command line argument parser
+    
+    The parser only depends on `only`, so it is built once per subcommand
+    and reused when main() runs repeatedly in one process.
+    
+    Args:
+        only: Build just this subcommand's parser. When None, every
+            subcommand is registered (needed for top-level --help).
+    """
+    parser = argparse.ArgumentParser(
+        description='Magento to Medusa Data Sync Tool',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+            Examples:
+            %(prog)s sync categories
+            %(prog)s sync products --batch-size 50 --max-pages 10
+            %(prog)s sync all --dry-run
+            %(prog)s dlq export --entity products --format csv
+            %(prog)s pipeline run
+            %(prog)s pipeline run --async --dry-run
+            %(prog)s pipeline status
+            %(prog)s pipeline cancel --pipeline-id pipeline_20231201_123456
+            %(prog)s pipeline resume --state-file pipeline_state_20231201_123456.json
+        """
+    )
+    
+    # Main command
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+    
+    if only in SUBPARSER_BUILDERS:
+        SUBPARSER_BUILDERS[only](subparsers)
+    else:
+        for build in SUBPARSER_BUILDERS.values():
+            build(subparsers)
     
     return parser
 
 
 def main():
     """Main CLI entry point"""
-    parser = create_parser()
+    parser = create_parser(only=_sniff_subcommand(sys.argv[1:]))
     args = parser.parse_args()
     
     if not args.command:
@@ -139,6 +175,7 @@ def main():
         return
     
     # Configure logging
+    from utils.logger import setup_logger
     setup_logger()
     
     logger.info("=" * 70)
@@ -153,9 +190,11 @@ def main():
         # Commands that need connectors
         needs_connectors = ['sync', 'test', 'pipeline']
         if args.command in needs_connectors:
+            from connectors import get_magento, get_medusa
+
             logger.info("Initializing connectors...")
-            magento = MagentoConnector()
-            medusa = MedusaConnector()
+            magento = get_magento()
+            medusa = get_medusa()
         
         # Execute command
         if args.command == 'sync':
@@ -181,7 +220,7 @@ def main():
         sys.exit(1)
 
 
-def test_connections(magento: MagentoConnector, medusa: MedusaConnector):
+def test_connections(magento: 'MagentoConnector', medusa: 'MedusaConnector'):
     """Test connections to both systems"""
     try:
         magento.test_connection()
@@ -198,52 +237,52 @@ def test_connections(magento: MagentoConnector, medusa: MedusaConnector):
         raise
 
 
-def handle_sync_command(args, magento: MagentoConnector, medusa: MedusaConnector):
+def handle_sync_command(args, magento: 'MagentoConnector', medusa: 'MedusaConnector'):
     """Handle sync command"""
+    import asyncio
+    from services.category_sync_service import CategorySyncService
+    from services.product_sync_service import ProductSyncService
+    from services.customer_sync_service import CustomerSyncService
+
     logger.info(f"Starting sync for: {args.entity}")
     logger.info(f"Batch size: {args.batch_size}, Dry run: {args.dry_run}")
     
     if args.dry_run:
         logger.warning("DRY RUN MODE - No changes will be made")
     
-    results = {}
-    
-    if args.entity in ['all', 'categories']:
+    def sync_categories() -> Dict[str, Any]:
         logger.info("\n" + "=" * 60)
         logger.info("SYNCING CATEGORIES")
         logger.info("=" * 60)
         
         service = CategorySyncService(magento, medusa)
         category_result = service.sync_all()
-        results['categories'] = category_result
         
         if args.dry_run:
             logger.info("Dry run - would have synced categories")
         else:
             logger.info(f"Category sync completed: {len(category_result.get('mapping', {}))} items")
+        return category_result
     
-    if args.entity in ['all', 'products']:
+    def sync_products(category_mapping: Dict) -> Dict[str, Any]:
         logger.info("\n" + "=" * 60)
         logger.info("SYNCING PRODUCTS")
         logger.info("=" * 60)
         
-        # Get category mapping if categories were synced
-        category_mapping = results.get('categories', {}).get('mapping', {})
-        
         service = ProductSyncService(magento, medusa, category_mapping)
         product_result = service.sync_all(
             batch_size=args.batch_size,
             max_pages=args.max_pages
         )
-        results['products'] = product_result
         
         if args.dry_run:
             logger.info("Dry run - would have synced products")
         else:
             stats = product_result.get('stats', {})
             logger.info(f"Product sync completed: {stats.get('successful', 0)} successful")
+        return product_result
     
-    if args.entity in ['all', 'customers']:
+    def sync_customers() -> Dict[str, Any]:
         logger.info("\n" + "=" * 60)
         logger.info("SYNCING CUSTOMERS")
         logger.info("=" * 60)
@@ -253,13 +292,36 @@ def handle_sync_command(args, magento: MagentoConnector, medusa: MedusaConnector
             batch_size=args.batch_size,
             max_pages=args.max_pages
         )
-        results['customers'] = customer_result
         
         if args.dry_run:
             logger.info("Dry run - would have synced customers")
         else:
             stats = customer_result.get('stats', {})
             logger.info(f"Customer sync completed: {stats.get('successful', 0)} successful")
+        return customer_result
+    
+    async def run_syncs() -> Dict[str, Any]:
+        # Only products depend on categories (for the category mapping), so
+        # customers run in parallel with the categories -> products chain.
+        results = {}
+        customers_task = None
+        if args.entity in ['all', 'customers']:
+            customers_task = asyncio.create_task(asyncio.to_thread(sync_customers))
+        
+        if args.entity in ['all', 'categories']:
+            results['categories'] = await asyncio.to_thread(sync_categories)
+        
+        if args.entity in ['all', 'products']:
+            # Get category mapping if categories were synced
+            category_mapping = results.get('categories', {}).get('mapping', {})
+            results['products'] = await asyncio.to_thread(sync_products, category_mapping)
+        
+        if customers_task:
+            results['customers'] = await customers_task
+        
+        return results
+    
+    results = asyncio.run(run_syncs())
     
     # Save results if output specified
     if args.output:
@@ -271,6 +333,7 @@ def handle_sync_command(args, magento: MagentoConnector, medusa: MedusaConnector
 
 def handle_dlq_command(args):
     """Handle DLQ command"""
+    from core.dlq_handler import DLQHandler
     
     entities = []
     if args.entity == 'all' or not args.entity:
@@ -285,27 +348,25 @@ def handle_dlq_command(args):
             print(f"{entity.capitalize()}: {count} items")
     
     elif args.action == 'export':
-        for entity in entities:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        def export_entity(entity: str) -> str:
             dlq = DLQHandler(entity)
-            output_file = args.output or f"{entity}_dlq_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{args.format}"
+            output_file = args.output or f"{entity}_dlq_export_{timestamp}.{args.format}"
             if args.format == 'csv':
                 dlq.export_to_csv(output_file)
             else:
-                items = []
-                pattern = f"{entity}_*.json"
-                dlq_dir = Path("dlq")
-                for filepath in dlq_dir.glob(pattern):
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            items.extend(data)
-                    except Exception as e:
-                        logger.warning(f"Failed to read DLQ file {filepath}: {e}")
-                
-                with open(output_file, 'w') as f:
-                    json.dump(items, f, indent=2)
-            
-            print(f"Exported {entity} DLQ to {output_file}")
+                dlq.export_to_json(output_file)
+            return output_file
+        
+        # Entities export to separate files in parallel; a shared --output
+        # file has to be written one entity after another
+        workers = 1 if args.output else len(entities)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for entity, output_file in zip(entities, pool.map(export_entity, entities)):
+                print(f"Exported {entity} DLQ to {output_file}")
     
     elif args.action == 'retry':
         print("Retry functionality not implemented yet")
@@ -336,7 +397,7 @@ def handle_config_command(args):
         generate_mapping_template(args.mapping)
 
 
-def handle_test_command(args, magento: MagentoConnector, medusa: MedusaConnector):
+def handle_test_command(args, magento: 'MagentoConnector', medusa: 'MedusaConnector'):
     """Handle test command"""
     if args.system in ['both', 'magento']:
         try:
@@ -357,7 +418,7 @@ def handle_test_command(args, magento: MagentoConnector, medusa: MedusaConnector
             print(f"✗ Medusa: Connection failed - {e}")
 
 
-def handle_pipeline_command(args, magento: MagentoConnector, medusa: MedusaConnector):
+def handle_pipeline_command(args, magento: 'MagentoConnector', medusa: 'MedusaConnector'):
     """Handle pipeline commands"""
     if args.pipeline_action == 'run':
         handle_pipeline_run(args, magento, medusa)
@@ -371,8 +432,10 @@ def handle_pipeline_command(args, magento: MagentoConnector, medusa: MedusaConne
         print(f"Unknown pipeline action: {args.pipeline_action}")
 
 
-def handle_pipeline_run(args, magento: MagentoConnector, medusa: MedusaConnector):
+def handle_pipeline_run(args, magento: 'MagentoConnector', medusa: 'MedusaConnector'):
     """Run pipeline"""
+    from core.pipeline.pipeline import create_pipeline
+
     logger.info(f"Running {'async ' if args.async_run else ''}pipeline...")
     
     # Test connections first
@@ -381,8 +444,11 @@ def handle_pipeline_run(args, magento: MagentoConnector, medusa: MedusaConnector
     # Load config if specified
     config = {}
     if args.config:
+        import yaml
+        from utils.yaml_loader import YamlLoader
+        
         with open(args.config, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YamlLoader)
     
     # Create pipeline
     pipeline_type = "async" if args.async_run else "default"
@@ -391,6 +457,7 @@ def handle_pipeline_run(args, magento: MagentoConnector, medusa: MedusaConnector
     # Run pipeline
     try:
         if args.async_run:
+            import asyncio
             result = asyncio.run(pipeline.run_async(dry_run=args.dry_run))
         else:
             result = pipeline.run(dry_run=args.dry_run)
@@ -404,8 +471,7 @@ def handle_pipeline_run(args, magento: MagentoConnector, medusa: MedusaConnector
         else:
             output_file = f"pipeline_results_{pipeline.pipeline_id}.json"
         
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2, default=str)
+        json_utils.dump_file(result, output_file, default=str)
         
         logger.info(f"Pipeline results saved to {output_file}")
         
@@ -432,54 +498,140 @@ def handle_pipeline_status(args):
         state_file = f"pipeline_state_{pipeline_id}.json"
         report_file = f"pipeline_results_{pipeline_id}.json"
         
-        if os.path.exists(state_file):
+        try:
+            state = json_utils.load_file(state_file)
+        except FileNotFoundError:
+            state = None
+        
+        if state is not None:
             print(f"Pipeline {pipeline_id}: IN PROGRESS (state file exists)")
-            with open(state_file, 'r') as f:
-                state = json.load(f)
             print(f"  Status: {state.get('status', 'unknown')}")
             print(f"  Last update: {state.get('timestamp', 'unknown')}")
-        elif os.path.exists(report_file):
-            print(f"Pipeline {pipeline_id}: COMPLETED (report file exists)")
-            with open(report_file, 'r') as f:
-                report = json.load(f)
-            print(f"  Final status: {report.get('status', 'unknown')}")
-            print(f"  Duration: {report.get('stats', {}).get('duration', 'unknown')}")
-        else:
+            return
+        
+        try:
+            report = json_utils.load_file(report_file)
+        except FileNotFoundError:
             print(f"Pipeline {pipeline_id}: NOT FOUND")
+            return
+        
+        print(f"Pipeline {pipeline_id}: COMPLETED (report file exists)")
+        print(f"  Final status: {report.get('status', 'unknown')}")
+        print(f"  Duration: {report.get('stats', {}).get('duration', 'unknown')}")
     else:
         # List all pipelines
         print("Looking for pipeline files...")
         
-        state_files = list(Path('.').glob('pipeline_state_*.json'))
-        report_files = list(Path('.').glob('pipeline_results_*.json'))
+        pipeline_files = _scan_pipeline_files()
+        format_seconds = '{:.2f}s'.format
         
         print("\nActive Pipelines (state files):")
-        for file in state_files:
+        for file in pipeline_files['state']:
             try:
-                with open(file, 'r') as f:
-                    state = json.load(f)
+                state = _read_pipeline_fields(file.path, ('pipeline_id', 'status'), ('timestamp',))
                 pid = state.get('pipeline_id', 'unknown')
                 status = state.get('status', 'unknown')
                 timestamp = state.get('timestamp', 'unknown')
                 print(f"  {pid}: {status} ({timestamp})")
             except Exception:
-                print(f"  {file.stem}: Error reading file")
+                print(f"  {file.name[:-5]}: Error reading file")
         
         print("\nCompleted Pipelines (report files):")
-        for file in report_files:
+        for file in pipeline_files['results']:
             try:
-                with open(file, 'r') as f:
-                    report = json.load(f)
+                report = _read_pipeline_fields(file.path, ('pipeline_id', 'status', 'duration'))
                 pid = report.get('pipeline_id', 'unknown')
                 status = report.get('status', 'unknown')
-                duration = report.get('stats', {}).get('duration', 'unknown')
-                if duration and isinstance(duration, (int, float)):
-                    duration_str = f"{duration:.2f}s"
-                else:
-                    duration_str = str(duration)
+                # _read_pipeline_fields returns duration as a float or None
+                duration = report.get('duration')
+                duration_str = format_seconds(duration) if duration else 'unknown'
                 print(f"  {pid}: {status} ({duration_str})")
             except Exception:
-                print(f"  {file.stem}: Error reading file")
+                print(f"  {file.name[:-5]}: Error reading file")
+
+
+# Pipeline listings only need a few top-level fields. The head/tail scans rely
+# on the key order of the writers, not on indentation: SyncPipeline._generate_report
+# puts pipeline_id, status and stats (duration) ahead of the bulky step_results, and
+# SyncPipeline._handle_interruption puts pipeline_id and status first and
+# timestamp last. Keep those dicts ordered that way when changing them.
+_PIPELINE_FILE_PATTERN = re.compile(r'pipeline_(state|results)_.+\.json')
+_PIPELINE_FIELD_READ_SIZE = 4096
+_PIPELINE_FIELD_PATTERNS = {
+    'pipeline_id': re.compile(rb'"pipeline_id"\s*:\s*"([^"]*)"'),
+    'status': re.compile(rb'"status"\s*:\s*"([^"]*)"'),
+    'timestamp': re.compile(rb'"timestamp"\s*:\s*"([^"]*)"'),
+    'duration': re.compile(rb'"duration"\s*:\s*(null|-?[0-9.eE+\-]+)'),
+}
+
+
+def _scan_pipeline_files() -> Dict[str, List[os.DirEntry]]:
+    """Collect pipeline state and results files in one directory pass, oldest first"""
+    pipeline_files = {'state': [], 'results': []}
+    match = _PIPELINE_FILE_PATTERN.fullmatch
+    with os.scandir('.') as it:
+        for entry in it:
+            m = match(entry.name)
+            if m and entry.is_file():
+                pipeline_files[m.group(1)].append(entry)
+    
+    for entries in pipeline_files.values():
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+    return pipeline_files
+
+
+def _select_pipeline_fields(data: Dict[str, Any], fields) -> Dict[str, Any]:
+    """Pick listing fields from a fully parsed pipeline file"""
+    duration = (data.get('stats') or {}).get('duration')
+    data['duration'] = float(duration) if isinstance(duration, (int, float)) else None
+    return {field: data[field] for field in fields if field in data}
+
+
+def _read_pipeline_fields(path: str, head_fields=(), tail_fields=()) -> Dict[str, Any]:
+    """
+    Extract top-level fields from a pipeline JSON file
+    
+    Small files are read once and parsed with orjson; large ones are only
+    scanned at the head and tail.
+    
+    Args:
+        path: Pipeline state/results file
+        head_fields: Fields taken from their first occurrence in the file head
+        tail_fields: Fields taken from their last occurrence in the file tail
+    """
+    size = _PIPELINE_FIELD_READ_SIZE
+    with open(path, 'rb') as f:
+        head = f.read(size)
+        if len(head) < size:
+            return _select_pipeline_fields(json_utils.loads(head), (*head_fields, *tail_fields))
+        if tail_fields:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - size, 0))
+            tail = f.read()
+        else:
+            tail = head
+    
+    values = {}
+    for field in head_fields:
+        match = _PIPELINE_FIELD_PATTERNS[field].search(head)
+        if match:
+            values[field] = match.group(1)
+    for field in tail_fields:
+        matches = _PIPELINE_FIELD_PATTERNS[field].findall(tail)
+        if matches:
+            values[field] = matches[-1]
+    
+    if 'pipeline_id' in head_fields and 'pipeline_id' not in values:
+        # Unexpected layout - fall back to a full parse
+        data = json_utils.loads(Path(path).read_bytes())
+        return _select_pipeline_fields(data, (*head_fields, *tail_fields))
+    
+    for field, raw in values.items():
+        if field == 'duration':
+            values[field] = None if raw == b'null' else float(raw)
+        else:
+            values[field] = raw.decode('utf-8')
+    return values
 
 
 def handle_pipeline_cancel(args):
@@ -489,15 +641,14 @@ def handle_pipeline_cancel(args):
     # Look for active pipeline with this ID
     state_file = f"pipeline_state_{pipeline_id}.json"
     
-    if not os.path.exists(state_file):
+    try:
+        state = json_utils.load_file(state_file)
+    except FileNotFoundError:
         print(f"No active pipeline found with ID: {pipeline_id}")
         print("Note: Only pipelines with saved state files can be cancelled")
         return
     
     # Check if pipeline is actually running
-    with open(state_file, 'r') as f:
-        state = json.load(f)
-    
     current_status = state.get('status', 'unknown')
     if current_status not in ['running', 'paused']:
         print(f"Pipeline {pipeline_id} is not running (status: {current_status})")
@@ -513,8 +664,7 @@ def handle_pipeline_cancel(args):
     state['status'] = 'cancelled'
     state['cancelled_at'] = datetime.now().isoformat()
     
-    with open(state_file, 'w') as f:
-        json.dump(state, f, indent=2)
+    json_utils.dump_file(state, state_file)
     
     print(f"Pipeline {pipeline_id} marked as cancelled")
     
@@ -524,11 +674,16 @@ def handle_pipeline_cancel(args):
     print(f"State file moved to: {cancelled_file}")
 
 
-def handle_pipeline_resume(args, magento: MagentoConnector, medusa: MedusaConnector):
+def handle_pipeline_resume(args, magento: 'MagentoConnector', medusa: 'MedusaConnector'):
     """Resume a pipeline from saved state"""
+    from core.pipeline.sync_pipeline import SyncPipeline
+
     state_file = args.state_file
     
-    if not os.path.exists(state_file):
+    # Load state
+    try:
+        state = json_utils.load_file(state_file)
+    except FileNotFoundError:
         print(f"State file not found: {state_file}")
         return
     
@@ -537,10 +692,6 @@ def handle_pipeline_resume(args, magento: MagentoConnector, medusa: MedusaConnec
     # Test connections first
     test_connections(magento, medusa)
     
-    # Load state
-    with open(state_file, 'r') as f:
-        state = json.load(f)
-    
     pipeline_id = state.get('pipeline_id')
     current_status = state.get('status', 'unknown')
     
@@ -561,8 +712,7 @@ def handle_pipeline_resume(args, magento: MagentoConnector, medusa: MedusaConnec
     
     # Save results
     output_file = f"pipeline_resumed_{pipeline_id}.json"
-    with open(output_file, 'w') as f:
-        json.dump(result, f, indent=2, default=str)
+    json_utils.dump_file(result, output_file, default=str)
     
     logger.info(f"Resumed pipeline results saved to {output_file}")
     
@@ -574,6 +724,8 @@ def handle_pipeline_resume(args, magento: MagentoConnector, medusa: MedusaConnec
 
 def validate_mapping_config(mapping_file: str):
     """Validate mapping configuration file"""
+    from core.mapping.mapping_factory import MappingFactory
+
     factory = MappingFactory(Path("config/mapping"))
     entities = ["category", "product", "customer"] if not mapping_file else [mapping_file]
     
@@ -597,49 +749,54 @@ def validate_mapping_config(mapping_file: str):
             print(f"  ✗ Validation failed: {e}")
 
 
-def generate_mapping_template(entity_type: str):
-    """Generate mapping template for an entity"""
-    templates = {
-        'category': {
-            'version': '1.0',
-            'source': 'magento',
-            'target': 'medusa',
-            'entity': 'category',
-            'fields': {
-                'name': {
-                    'target': 'name',
-                    'required': True,
-                    'type': 'string'
-                }
+# Starter mapping files written by `config generate`
+_MAPPING_TEMPLATES = {
+    'category': {
+        'version': '1.0',
+        'source': 'magento',
+        'target': 'medusa',
+        'entity': 'category',
+        'fields': {
+            'name': {
+                'target': 'name',
+                'required': True,
+                'type': 'string'
             }
-        },
-        'product': {
-            'version': '1.0',
-            'source': 'magento',
-            'target': 'medusa',
-            'entity': 'product',
-            'fields': {
-                'sku': {
-                    'target': 'sku',
-                    'required': True,
-                    'type': 'string'
-                }
+        }
+    },
+    'product': {
+        'version': '1.0',
+        'source': 'magento',
+        'target': 'medusa',
+        'entity': 'product',
+        'fields': {
+            'sku': {
+                'target': 'sku',
+                'required': True,
+                'type': 'string'
             }
         }
     }
-    
+}
+
+
+def generate_mapping_template(entity_type: str):
+    """Generate mapping template for an entity"""
     if not entity_type:
         print("Please specify entity type with --mapping (category, product, customer)")
         return
     
-    if entity_type not in templates:
+    if entity_type not in _MAPPING_TEMPLATES:
         print(f"Unknown entity type: {entity_type}")
         return
     
     output_file = f"{entity_type}_mapping_template.yaml"
     
+    import yaml
+    from utils.yaml_loader import YamlDumper
+    
     with open(output_file, 'w') as f:
-        yaml.dump(templates[entity_type], f, default_flow_style=False)
+        yaml.dump(_MAPPING_TEMPLATES[entity_type], f, Dumper=YamlDumper, default_flow_style=False)
     
     print(f"Generated template: {output_file}")
 
@@ -647,8 +804,7 @@ def generate_mapping_template(entity_type: str):
 def save_results(results: Dict, output_file: str):
     """Save sync results to file"""
     
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2, default=str)
+    json_utils.dump_file(results, output_file, default=str)
     
     logger.info(f"Results saved to {output_file}")
 
@@ -1,28 +1,123 @@
 import os
+import pickle
+import stat
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load environment variables
 env_path = Path(__file__).resolve().parent.parent / '.env'
-load_dotenv(env_path)
+# Parsed .env values, keyed by the .env mtime. Set MAGENTO_SETTINGS_NOCACHE=1 to bypass.
+cache_path = Path.home() / '.cache' / 'magento_medusa' / 'settings.pkl'
+_env_loaded = False
+
+
+def _cache_is_trusted() -> bool:
+    """The cache holds secrets and is unpickled, so only trust a private file we own"""
+    try:
+        st = cache_path.stat()
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _write_cache(data: dict):
+    """Write the cache readable by the owner only, replacing it atomically"""
+    cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    os.chmod(cache_path.parent, 0o700)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(data, f)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _read_env_file() -> dict:
+    """Return the key/values of .env, using the pickle cache when it is fresh"""
+    try:
+        env_mtime = env_path.stat().st_mtime
+    except OSError:
+        return {}
+
+    use_cache = os.getenv('MAGENTO_SETTINGS_NOCACHE') != '1'
+    if use_cache and _cache_is_trusted():
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('path') == str(env_path) and cached.get('mtime') == env_mtime:
+                return cached['values']
+        except Exception:
+            pass
+
+    from dotenv import dotenv_values
+    values = dict(dotenv_values(env_path))
+
+    if use_cache:
+        try:
+            _write_cache({'path': str(env_path), 'mtime': env_mtime, 'values': values})
+        except OSError:
+            pass
+
+    return values
+
+
+def _load_env():
+    """Load environment variables from .env (once, on first setting access)"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    # Same semantics as load_dotenv(): real environment variables win
+    for key, value in _read_env_file().items():
+        if value is not None:
+            os.environ.setdefault(key, value)
 
 
 def get_env(var_name: str, default=None, mandatory=False):
     """Get environment variable with validation"""
+    _load_env()
     value = os.getenv(var_name, default)
     if mandatory and value is None:
         raise ValueError(f"Environment variable {var_name} is required but not set")
     return value
 
 
-class MagentoSettings:
+def _to_bool(value: str) -> bool:
+    return value.lower() == 'true'
+
+
+class LazySettings(type):
+    """
+    Metaclass that resolves settings from the environment on first access.
+
+    Each settings class declares ``_ENV = {attr: (var_name, default, mandatory, cast)}``.
+    Reading ``cls.ATTR`` calls ``get_env`` once and caches the value on the class,
+    so nothing touches ``.env`` until a setting is actually needed.
+    """
+
+    def __getattr__(cls, name):
+        spec = cls.__dict__.get('_ENV', {}).get(name)
+        if spec is None:
+            raise AttributeError(f"{cls.__name__} has no setting {name}")
+        var_name, default, mandatory, cast = spec
+        value = get_env(var_name, default, mandatory=mandatory)
+        if cast is not None and value is not None:
+            value = cast(value)
+        setattr(cls, name, value)
+        return value
+
+
+class MagentoSettings(metaclass=LazySettings):
     """Magento configuration"""
-    BASE_URL = get_env('MAGENTO_BASE_URL', mandatory=True)
-    TOKEN = get_env('MAGENTO_TOKEN', mandatory=True)
-    ADMIN_USERNAME = get_env('MAGENTO_ADMIN_USERNAME', 'admin')
-    ADMIN_PASSWORD = get_env('MAGENTO_ADMIN_PASSWORD', '')
-    VERIFY_SSL = get_env('MAGENTO_VERIFY_SSL', 'false').lower() == 'true'
-    TIMEOUT = int(get_env('MAGENTO_TIMEOUT', '30'))
+    _ENV = {
+        'BASE_URL': ('MAGENTO_BASE_URL', None, True, None),
+        'TOKEN': ('MAGENTO_TOKEN', None, True, None),
+        'ADMIN_USERNAME': ('MAGENTO_ADMIN_USERNAME', 'admin', False, None),
+        'ADMIN_PASSWORD': ('MAGENTO_ADMIN_PASSWORD', '', False, None),
+        'VERIFY_SSL': ('MAGENTO_VERIFY_SSL', 'false', False, _to_bool),
+        'TIMEOUT': ('MAGENTO_TIMEOUT', '30', False, int),
+    }
     MAGENTO_MEDIA_ROOT = Path(
             "D:/internship/connector_magento_medusa_v2/media/catalog"
         )    
@@ -36,13 +131,15 @@ class MagentoSettings:
     }
 
 
-class MedusaSettings:
+class MedusaSettings(metaclass=LazySettings):
     """Medusa configuration"""
-    BASE_URL = get_env('MEDUSA_BASE_URL', mandatory=True)
-    API_KEY = get_env('MEDUSA_API_KEY', mandatory=True)
-    ADMIN_EMAIL = get_env('MEDUSA_ADMIN_EMAIL', '')
-    ADMIN_PASSWORD = get_env('MEDUSA_ADMIN_PASSWORD', '')
-    TIMEOUT = int(get_env('MEDUSA_TIMEOUT', '30'))
+    _ENV = {
+        'BASE_URL': ('MEDUSA_BASE_URL', None, True, None),
+        'API_KEY': ('MEDUSA_API_KEY', None, True, None),
+        'ADMIN_EMAIL': ('MEDUSA_ADMIN_EMAIL', '', False, None),
+        'ADMIN_PASSWORD': ('MEDUSA_ADMIN_PASSWORD', '', False, None),
+        'TIMEOUT': ('MEDUSA_TIMEOUT', '30', False, int),
+    }
     
     # API endpoints
     ENDPOINTS = {
@@ -53,12 +150,14 @@ class MedusaSettings:
     }
 
 
-class CloudinarySettings:
+class CloudinarySettings(metaclass=LazySettings):
     """Cloudinary configuration for image uploads"""
-    CLOUD_NAME = get_env('CLOUDINARY_CLOUD_NAME')
-    API_KEY = get_env('CLOUDINARY_API_KEY')
-    API_SECRET = get_env('CLOUDINARY_API_SECRET')
-    SECURE = get_env('CLOUDINARY_SECURE', 'true').lower() == 'true'
+    _ENV = {
+        'CLOUD_NAME': ('CLOUDINARY_CLOUD_NAME', None, False, None),
+        'API_KEY': ('CLOUDINARY_API_KEY', None, False, None),
+        'API_SECRET': ('CLOUDINARY_API_SECRET', None, False, None),
+        'SECURE': ('CLOUDINARY_SECURE', 'true', False, _to_bool),
+    }
     
     @classmethod
     def is_configured(cls):
@@ -66,33 +165,37 @@ class CloudinarySettings:
         return all([cls.CLOUD_NAME, cls.API_KEY, cls.API_SECRET])
 
 
-class SyncSettings:
+class SyncSettings(metaclass=LazySettings):
     """Sync configuration"""
-    BATCH_SIZE = int(get_env('SYNC_BATCH_SIZE', '50'))
-    MAX_RETRIES = int(get_env('SYNC_MAX_RETRIES', '3'))
-    RETRY_DELAY = int(get_env('SYNC_RETRY_DELAY', '5'))
-    DRY_RUN = get_env('SYNC_DRY_RUN', 'false').lower() == 'true'
-    
-    # Rate limiting
-    REQUESTS_PER_MINUTE = int(get_env('REQUESTS_PER_MINUTE', '60'))
-    
-    # Timeouts
-    CONNECTION_TIMEOUT = int(get_env('CONNECTION_TIMEOUT', '30'))
-    READ_TIMEOUT = int(get_env('READ_TIMEOUT', '60'))
+    _ENV = {
+        'BATCH_SIZE': ('SYNC_BATCH_SIZE', '50', False, int),
+        'MAX_RETRIES': ('SYNC_MAX_RETRIES', '3', False, int),
+        'RETRY_DELAY': ('SYNC_RETRY_DELAY', '5', False, int),
+        'DRY_RUN': ('SYNC_DRY_RUN', 'false', False, _to_bool),
+        # Rate limiting
+        'REQUESTS_PER_MINUTE': ('REQUESTS_PER_MINUTE', '60', False, int),
+        # Concurrent API calls per connector (pagination fan-out, bulk deletes)
+        'CONCURRENT_REQUESTS': ('SYNC_CONCURRENT_REQUESTS', '8', False, int),
+        # Timeouts
+        'CONNECTION_TIMEOUT': ('CONNECTION_TIMEOUT', '30', False, int),
+        'READ_TIMEOUT': ('READ_TIMEOUT', '60', False, int),
+    }
 
 
-class LogSettings:
+class LogSettings(metaclass=LazySettings):
     """Logging configuration"""
-    LEVEL = get_env('LOG_LEVEL', 'INFO')
-    FILE = get_env('LOG_FILE', 'logs/sync.log')
-    FORMAT = get_env('LOG_FORMAT', '%(asctime)s - %(levelname)s - %(message)s')
-    MAX_SIZE = int(get_env('LOG_MAX_SIZE', '10485760'))  # 10MB
-    BACKUP_COUNT = int(get_env('LOG_BACKUP_COUNT', '5'))
-
-
-# Export settings classes
-MAGENTO = MagentoSettings()
-MEDUSA = MedusaSettings()
-CLOUDINARY = CloudinarySettings()
-SYNC = SyncSettings()
-LOG = LogSettings()
\ No newline at end of file
+    _ENV = {
+        'LEVEL': ('LOG_LEVEL', 'INFO', False, None),
+        'FILE': ('LOG_FILE', 'logs/sync.log', False, None),
+        'FORMAT': ('LOG_FORMAT', '%(asctime)s - %(levelname)s - %(message)s', False, None),
+        'MAX_SIZE': ('LOG_MAX_SIZE', '10485760', False, int),  # 10MB
+        'BACKUP_COUNT': ('LOG_BACKUP_COUNT', '5', False, int),
+    }
+
+
+# Export settings classes (values resolve lazily on attribute access)
+MAGENTO = MagentoSettings
+MEDUSA = MedusaSettings
+CLOUDINARY = CloudinarySettings
+SYNC = SyncSettings
+LOG = LogSettings
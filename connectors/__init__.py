@@ -0,0 +1,20 @@
+_magento = None
+_medusa = None
+
+
+def get_magento():
+    """Return the process-wide MagentoConnector, creating it on first use"""
+    global _magento
+    if _magento is None:
+        from connectors.magento.magento_connector import MagentoConnector
+        _magento = MagentoConnector()
+    return _magento
+
+
+def get_medusa():
+    """Return the process-wide MedusaConnector, creating it on first use"""
+    global _medusa
+    if _medusa is None:
+        from connectors.medusa.medusa_connector import MedusaConnector
+        _medusa = MedusaConnector()
+    return _medusa
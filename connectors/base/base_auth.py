@@ -1,9 +1,10 @@
 import threading
 import time
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 
 from connectors.base.http_client import HttpClient
+from utils import json_utils
 
 logger = logging.getLogger(__name__)
 
@@ -12,15 +13,18 @@ class BaseAuth:
 
     login_endpoint: Optional[str] = None  # e.g. "rest/V1/integration/admin/token"
     refresh_endpoint: Optional[str] = None  # optional
+    refresh_skew: int = 60  # seconds before expiry to start a background refresh
 
     def __init__(self, base_url: str, verify_ssl: bool = False, client_kwargs: Optional[dict] = None):
         if not base_url:
             raise ValueError("Base URL missing")
         client_kwargs = client_kwargs or {}
         self.client = HttpClient(base_url=base_url, verify_ssl=verify_ssl, **client_kwargs)
-        self._token: Optional[str] = None
-        self._token_expires_at: Optional[float] = None  # epoch seconds
+        # (token, expires_at epoch seconds, headers); replaced as a whole under
+        # _lock and read without it, so readers always see a consistent triple
+        self._auth_state: Tuple[Optional[str], Optional[float], Optional[dict]] = (None, None, None)
         self._lock = threading.RLock()
+        self._refreshing = False
 
     def login(self) -> str:
         if not self.login_endpoint:
@@ -34,21 +38,16 @@ class BaseAuth:
         if not resp.ok:
             raise Exception(f"Login failed: {resp.status_code} - {resp.text}")
 
-        token = self.extract_token(resp)
+        body = json_utils.loads(resp.content)
+        token = self.extract_token(body)
         if not token:
             raise Exception("Login did not return token")
 
-        with self._lock:
-            self._token = token
-            expires_in = self.extract_expires_in(resp)
-            if expires_in:
-                # subtract small safety margin (e.g., 10s)
-                self._token_expires_at = time.time() + max(0, expires_in - 10)
-            else:
-                self._token_expires_at = None
+        expires_in = self.extract_expires_in(body)
+        self._set_token(token, expires_in)
 
         logger.info("Login successful, token set (expires_in=%s)", expires_in)
-        return self._token
+        return token
 
     def refresh(self) -> str:
         if self.refresh_endpoint:
@@ -57,54 +56,91 @@ class BaseAuth:
             if not resp.ok:
                 logger.warning("Refresh failed, falling back to login: %s", resp.status_code)
                 return self.login()
-            token = self.extract_refresh_token(resp)
-            with self._lock:
-                self._token = token
-                expires_in = self.extract_expires_in(resp)
-                if expires_in:
-                    self._token_expires_at = time.time() + max(0, expires_in - 10)
-                else:
-                    self._token_expires_at = None
+            body = json_utils.loads(resp.content)
+            token = self.extract_refresh_token(body)
+            self._set_token(token, self.extract_expires_in(body))
             logger.info("Refresh successful")
-            return self._token
+            return token
 
         # fallback: re-login
         logger.debug("No refresh endpoint configured, performing full login")
         return self.login()
 
-    def get_headers(self) -> dict:
+    def _set_token(self, token: str, expires_in: Optional[int]):
+        # subtract small safety margin (e.g., 10s)
+        expires_at = time.time() + max(0, expires_in - 10) if expires_in else None
+        headers = self.build_headers(token)
         with self._lock:
-            if not self._token:
-                self.login()
-                return {"Authorization": f"Bearer {self._token}", "Content-Type": "application/json"}
+            self._auth_state = (token, expires_at, headers)
 
-            if self._token_expires_at and time.time() >= self._token_expires_at:
-                logger.info("Token expired or about to expire, refreshing...")
-                try:
-                    self.refresh()
-                except Exception as e:
-                    logger.warning("Refresh failed, attempting re-login: %s", e)
-                    self.login()
+    @staticmethod
+    def build_headers(token: str) -> dict:
+        return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
 
-            return {"Authorization": f"Bearer {self._token}", "Content-Type": "application/json"}
+    def get_headers(self) -> dict:
+        """
+        Return the auth headers for the current token. The dict is cached per
+        token and shared between callers, so treat it as read-only.
+        """
+        # fast path: fresh token, no lock needed
+        token, expires_at, headers = self._auth_state
+        if token and (expires_at is None or time.time() < expires_at - self.refresh_skew):
+            return headers
+
+        with self._lock:
+            token, expires_at, headers = self._auth_state
+            if not token:
+                self.login()
+                return self._auth_state[2]
+
+            if expires_at:
+                now = time.time()
+                if now >= expires_at:
+                    logger.info("Token expired, refreshing...")
+                    self._refresh_or_login()
+                    headers = self._auth_state[2]
+                elif now >= expires_at - self.refresh_skew and not self._refreshing:
+                    # token still valid: keep serving it while a new one is fetched
+                    logger.info("Token about to expire, refreshing in background...")
+                    self._refreshing = True
+                    threading.Thread(target=self._safe_refresh, daemon=True).start()
+
+            return headers
+
+    def _refresh_or_login(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning("Refresh failed, attempting re-login: %s", e)
+            self.login()
+
+    def _safe_refresh(self):
+        try:
+            self._refresh_or_login()
+        except Exception as e:
+            # the current token is still valid; get_headers retries once it expires
+            logger.warning("Background token refresh failed: %s", e)
+        finally:
+            with self._lock:
+                self._refreshing = False
 
     # Must be overridden by provider
     def build_payload(self):
         raise NotImplementedError()
 
     # Optional override if provider gives expires_in
-    def extract_expires_in(self, resp) -> Optional[int]:
+    def extract_expires_in(self, body) -> Optional[int]:
         """
         Return number of seconds token is valid. Default: None (unknown).
-        Override to parse provider response.
+        Override to parse provider response; body is the already-decoded JSON.
         """
         return None
 
-    def extract_token(self, resp) -> str:
+    def extract_token(self, body) -> str:
         raise NotImplementedError()
 
     def build_refresh_payload(self):
         return None
 
-    def extract_refresh_token(self, resp):
-        return self.extract_token(resp)
\ No newline at end of file
+    def extract_refresh_token(self, body):
+        return self.extract_token(body)
\ No newline at end of file
@@ -1,10 +1,27 @@
+import threading
+import time
 from abc import ABC, abstractmethod
-from connectors.base.http_client import HttpClient
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import SYNC
+from connectors.base.http_client import HttpClient, POOL_MAXSIZE
+from connectors.base.throttle import AimdThrottle, response_congested
+from typing import Optional, Dict, Any, Tuple
+from utils import json_utils
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_SUPPORTED_METHODS = frozenset(["GET", "POST", "PUT", "DELETE"])
 
 
 class BaseConnector(ABC):
 
+    # worker threads for fanned-out requests (pagination, bulk deletes);
+    # None means SYNC.CONCURRENT_REQUESTS. Keep within the HTTP pool size.
+    max_workers: Optional[int] = None
+    # BaseAuth instance set by subclasses before calling super().__init__
+    auth = None
+    # seconds a successful check_connection() result is reused
+    probe_ttl: float = 60.0
+
     def __init__(
         self, 
         base_url: str, 
@@ -22,6 +39,22 @@ class BaseConnector(ABC):
             max_retries=max_retries,
             backoff_factor=backoff_factor,
         )
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # shared by every thread using this connector
+        self._throttle = AimdThrottle(max_concurrency=POOL_MAXSIZE)
+        # (time.monotonic(), result) of the last successful test_connection()
+        self._last_probe: Optional[Tuple[float, Any]] = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers or SYNC.CONCURRENT_REQUESTS,
+                        thread_name_prefix=type(self).__name__,
+                    )
+        return self._pool
 
     def _request(
         self,
@@ -33,19 +66,73 @@ class BaseConnector(ABC):
         data: Optional[Any] = None,
         timeout: Optional[int] = None,
     ) -> Any:
-        if not hasattr(self.client, method.lower()):
+        method = method.upper()
+        if method not in _SUPPORTED_METHODS:
             raise ValueError(f"Unsupported HTTP method: {method}")
 
-        resp = getattr(self.client, method.lower())(
-            path,
-            headers=headers,
-            params=params,
-            json=json,
-            data=data,
-            timeout=timeout,
-        )
+        self._ensure_auth()
+
+        if json is not None:
+            # serialize with orjson ourselves instead of letting requests use stdlib json
+            data = json_utils.dumps(json)
+            if "Content-Type" not in self.client.default_headers:
+                headers = {**headers, **_JSON_HEADERS} if headers else _JSON_HEADERS
+            json = None
+
+        self._throttle.acquire()
+        congested, resp_headers = True, None
+        try:
+            resp = self.client._request(
+                method,
+                path,
+                headers=headers,
+                params=params,
+                json=json,
+                data=data,
+                timeout=timeout,
+            )
+            congested, resp_headers = response_congested(resp), resp.headers
+        except Exception:
+            # don't let a cached probe mask an outage
+            self._last_probe = None
+            raise
+        finally:
+            self._throttle.release(congested, resp_headers)
+        if resp.status_code >= 500:
+            self._last_probe = None
         self._ensure_ok(resp)
-        return resp.json()
+        return json_utils.loads(resp.content)
+
+    def _ensure_auth(self):
+        """
+        Point the client's default headers at the current auth headers.
+        get_headers hands out one cached dict per token, so the client is only
+        touched after a login/refresh and the common path merges nothing.
+        """
+        if self.auth is None:
+            return
+        auth_headers = self.auth.get_headers()
+        if auth_headers is not self.client.default_headers:
+            self.client.default_headers = auth_headers
+
+    def check_connection(self) -> Any:
+        """
+        test_connection(), reusing the last successful result for probe_ttl
+        seconds. Any network error or 5xx response drops the cached result.
+        """
+        probe = self._last_probe
+        if probe is not None and time.monotonic() - probe[0] < self.probe_ttl:
+            return probe[1]
+        result = self.test_connection()
+        self._last_probe = (time.monotonic(), result)
+        return result
+
+    def close(self):
+        """Release the fan-out worker threads; the pooled HTTP session stays shared."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
 
     @staticmethod
     def _ensure_ok(resp):
@@ -1,12 +1,124 @@
 import time
 import random
 import logging
-from typing import Optional, Dict, Any
+import threading
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
 import requests
 from requests import Response, RequestException
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# keep-alive pool sizing shared by every client talking to the same base_url
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 64
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_METHODS = frozenset(["GET", "POST", "PUT", "DELETE"])
+
+_sessions: Dict[Tuple[str, bool, int, float, float], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+class BackoffRetry(Retry):
+    """
+    urllib3 Retry with "full jitter" backoff: sleep a random time in
+    [0, min(backoff_max, backoff_factor * 2 ** (attempt - 1))] so that
+    concurrent workers do not retry in lockstep.
+    Retry-After on 429/503 still takes precedence over the computed backoff.
+    """
+
+    def parse_retry_after(self, retry_after: str) -> float:
+        # urllib3 rejects fractional seconds with InvalidHeader; treat anything
+        # unparseable as "no hint" so the computed backoff applies instead
+        seconds = _parse_retry_after(retry_after)
+        return seconds if seconds is not None else 0
+
+    def get_backoff_time(self) -> float:
+        attempt = len(self.history)
+        if attempt == 0:
+            return 0
+        base = self.backoff_factor * (2 ** (attempt - 1))
+        return random.uniform(0, min(self.backoff_max, base))
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either as delta-seconds or as an HTTP-date.
+    Returns the wait in seconds (never negative) or None if it cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return max(0.0, dt.timestamp() - time.time())
+
+
+@lru_cache(maxsize=512)
+def _build_url_cached(base_url: str, endpoint: str) -> str:
+    # endpoints repeat heavily (products, categories, customers, ...)
+    if endpoint.startswith(("http://", "https://")):
+        return endpoint
+    return f"{base_url}/{endpoint.lstrip('/')}"
+
+
+def _build_retry(max_retries: int, backoff_factor: float, backoff_cap: float) -> Retry:
+    # max_retries counts total attempts, urllib3 counts retries after the first
+    return BackoffRetry(
+        total=max(0, max_retries - 1),
+        backoff_factor=backoff_factor,
+        backoff_max=backoff_cap,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _shared_session(
+    base_url: str,
+    verify_ssl: bool,
+    max_retries: int,
+    backoff_factor: float,
+    backoff_cap: float,
+) -> requests.Session:
+    """
+    Return the pooled session for base_url, creating it on first use so that
+    every connector/auth instance pointing at the same host reuses its sockets.
+    """
+    key = (base_url, verify_ssl, max_retries, backoff_factor, backoff_cap)
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            session.verify = verify_ssl
+            adapter = HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE,
+                pool_block=False,
+                max_retries=_build_retry(max_retries, backoff_factor, backoff_cap),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[key] = session
+        return session
+
 
 class HttpClient:
     
@@ -16,6 +128,7 @@ class HttpClient:
         timeout: int = 30,
         max_retries: int = 5,
         backoff_factor: float = 1.0,
+        backoff_cap: float = 30.0,
         session: Optional[requests.Session] = None,
         verify_ssl: bool = True,
         default_headers: Optional[Dict[str, str]] = None,
@@ -26,27 +139,17 @@ class HttpClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
+        self.backoff_cap = backoff_cap
         self.verify_ssl = verify_ssl
-        self._session = session or requests.Session()
-        self._session.verify = verify_ssl
+        if session is None:
+            session = _shared_session(self.base_url, verify_ssl, max_retries, backoff_factor, backoff_cap)
+        else:
+            session.verify = verify_ssl
+        self._session = session
         self.default_headers = default_headers or {}
 
     def _build_url(self, endpoint: str) -> str:
-        if endpoint.startswith("http://") or endpoint.startswith("https://"):
-            return endpoint
-        return f"{self.base_url}/{endpoint.lstrip('/')}"
-
-    def _sleep_backoff(self, attempt: int, retry_after: Optional[float] = None):
-        if retry_after is not None and retry_after > 0:
-            sleep_for = retry_after
-        else:
-            # exponential backoff: backoff_factor * (2 ** (attempt - 1))
-            base = self.backoff_factor * (2 ** (attempt - 1))
-            # jitter +/- 0..base*0.1
-            jitter = random.uniform(0, base * 0.1)
-            sleep_for = base + jitter
-        logger.debug("Sleeping for %.2f seconds before retry (attempt=%d)", sleep_for, attempt)
-        time.sleep(sleep_for)
+        return _build_url_cached(self.base_url, endpoint)
 
     def _request(
         self,
@@ -58,68 +161,38 @@ class HttpClient:
         data: Optional[Any] = None,
         timeout: Optional[int] = None,
     ) -> Response:
+        """
+        Send one request through the pooled session. Retries on network errors,
+        429 and 5xx are handled by the adapter's urllib3 Retry; once they are
+        exhausted the last response is returned (or the network error raised).
+        """
         url = self._build_url(endpoint)
-        hdrs = {**self.default_headers, **(headers or {})}
+        hdrs = {**self.default_headers, **headers} if headers else self.default_headers
         timeout = timeout or self.timeout
 
-        last_exc = None
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                logger.debug("HTTP %s %s attempt=%d params=%s", method.upper(), url, attempt, params)
-                resp = self._session.request(
-                    method=method,
-                    url=url,
-                    headers=hdrs,
-                    params=params,
-                    json=json,
-                    data=data,
-                    timeout=timeout,
-                )
-            except RequestException as e:
-                last_exc = e
-                logger.warning("Network error on %s %s: %s", method.upper(), url, e)
-                # treat as retryable network error
-                if attempt == self.max_retries:
-                    raise
-                self._sleep_backoff(attempt)
-                continue
-
-            # if success
-            if 200 <= resp.status_code < 300:
-                return resp
-
-            # handle rate limiting (429)
-            if resp.status_code == 429:
-                retry_after = None
-                ra = resp.headers.get("Retry-After")
-                if ra:
-                    try:
-                        retry_after = float(ra)
-                    except ValueError:
-                        # sometimes Retry-After is a HTTP-date; ignore parsing complexity here
-                        retry_after = None
-                logger.warning("Received 429 for %s %s. Retry-After=%s", method.upper(), url, ra)
-                if attempt == self.max_retries:
-                    return resp
-                self._sleep_backoff(attempt, retry_after=retry_after)
-                continue
-
-            # handle server errors (5xx)
-            if 500 <= resp.status_code < 600:
-                logger.warning("Server error %s on %s %s", resp.status_code, method.upper(), url)
-                if attempt == self.max_retries:
-                    return resp
-                self._sleep_backoff(attempt)
-                continue
-
-            # Client error (4xx other than 429) - do not retry by default
+        logger.debug("HTTP %s %s params=%s", method.upper(), url, params)
+        try:
+            resp = self._session.request(
+                method=method,
+                url=url,
+                headers=hdrs,
+                params=params,
+                json=json,
+                data=data,
+                timeout=timeout,
+            )
+        except RequestException as e:
+            logger.warning("Network error on %s %s: %s", method.upper(), url, e)
+            raise
+
+        if resp.status_code == 429:
+            logger.warning("Received 429 for %s %s after retries. Retry-After=%s",
+                           method.upper(), url, _parse_retry_after(resp.headers.get("Retry-After")))
+        elif 500 <= resp.status_code < 600:
+            logger.warning("Server error %s on %s %s after retries", resp.status_code, method.upper(), url)
+        elif not resp.ok:
             logger.debug("Non-retriable response %s for %s %s", resp.status_code, method.upper(), url)
-            return resp
-
-        # exhausted retries
-        if last_exc:
-            raise last_exc
-        raise RuntimeError("Exhausted retries but no response returned")
+        return resp
 
     def get(self, endpoint: str, **kwargs) -> Response:
         return self._request("GET", endpoint, **kwargs)
@@ -0,0 +1,109 @@
+import time
+import threading
+import logging
+from typing import Optional, Mapping
+
+logger = logging.getLogger(__name__)
+
+CONGESTION_STATUS_CODES = frozenset([429, 502, 503, 504])
+RATELIMIT_REMAINING_HEADERS = ("X-RateLimit-Remaining", "RateLimit-Remaining")
+RATELIMIT_RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset", "Retry-After")
+
+
+class AimdThrottle:
+    """
+    Adaptive concurrency limit for one API (additive increase, multiplicative
+    decrease). The limit halves on 429/5xx responses and grows by `increase`
+    after every window of `limit` clean responses. When the server reports
+    that its rate-limit budget is nearly used up, new requests are held until
+    the advertised reset.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        remaining_threshold: int = 2,
+        max_pause: float = 60.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self.remaining_threshold = remaining_threshold
+        self.max_pause = max_pause
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._clean = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_concurrency, int(self._limit))
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                wait_for = self._paused_until - time.monotonic()
+                if wait_for <= 0 and self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                self._cond.wait(timeout=wait_for if wait_for > 0 else None)
+
+    def release(self, congested: bool, headers: Optional[Mapping[str, str]] = None):
+        with self._cond:
+            self._in_flight -= 1
+            if congested:
+                self._limit = max(float(self.min_concurrency), self._limit * self.decrease)
+                self._clean = 0
+                logger.debug("Congestion signal, concurrency limit -> %d", self.limit)
+            else:
+                self._clean += 1
+                if self._clean >= self.limit:
+                    self._limit = min(float(self.max_concurrency), self._limit + self.increase)
+                    self._clean = 0
+
+            pause = self._pause_from_headers(headers) if headers else None
+            if pause:
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+                logger.info("Rate limit budget nearly exhausted, pausing requests for %.1fs", pause)
+            self._cond.notify_all()
+
+    def _pause_from_headers(self, headers: Mapping[str, str]) -> Optional[float]:
+        remaining = _first_header(headers, RATELIMIT_REMAINING_HEADERS)
+        if remaining is None:
+            return None
+        try:
+            if int(float(remaining)) > self.remaining_threshold:
+                return None
+        except ValueError:
+            return None
+
+        reset = _first_header(headers, RATELIMIT_RESET_HEADERS)
+        try:
+            seconds = float(reset) if reset is not None else 1.0
+        except ValueError:
+            seconds = 1.0
+        # some APIs send the reset as an epoch timestamp rather than a delta
+        if seconds > 10 ** 9:
+            seconds -= time.time()
+        return min(self.max_pause, max(0.0, seconds))
+
+
+def _first_header(headers: Mapping[str, str], names) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+def response_congested(resp) -> bool:
+    """True if resp, or any attempt urllib3 retried before it, signalled overload."""
+    if resp.status_code in CONGESTION_STATUS_CODES:
+        return True
+    retries = getattr(resp.raw, "retries", None)
+    return bool(retries and any(h.status in CONGESTION_STATUS_CODES for h in retries.history))
@@ -5,26 +5,28 @@ from connectors.base.base_auth import BaseAuth
 class MagentoAuth(BaseAuth):
 
     login_endpoint = "integration/admin/token"
+    # Magento does not return expires_in; admin tokens live 4h by default
+    # (Stores > Configuration > Services > OAuth > Access Token Expiration)
+    admin_token_lifetime = 4 * 3600
 
     def __init__(self):
         super().__init__(base_url=MAGENTO.BASE_URL, verify_ssl=False)
-        self.token = MAGENTO.TOKEN
-        self._token_expires_at = None
-        
-    def get_headers(self):
+        if not MAGENTO.ADMIN_PASSWORD:
+            # no admin credentials: use the static integration token, which never expires
+            self._set_token(MAGENTO.TOKEN, None)
+
+    def build_payload(self):
+        if not MAGENTO.ADMIN_USERNAME or not MAGENTO.ADMIN_PASSWORD:
+            raise ValueError("Magento admin credentials missing")
+
         return {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
+            "username": MAGENTO.ADMIN_USERNAME,
+            "password": MAGENTO.ADMIN_PASSWORD
         }
 
-    # def build_payload(self):
-    #     if not MAGENTO.ADMIN_USERNAME or not MAGENTO.ADMIN_PASSWORD:
-    #         raise ValueError("Magento admin credentials missing")
-
-    #     return {
-    #         "username": MAGENTO.ADMIN_USERNAME,
-    #         "password": MAGENTO.ADMIN_PASSWORD
-    #     }
+    def extract_token(self, body):
+        # the token endpoint returns a bare JSON string
+        return body
 
-    # def extract_token(self, resp):
-    #     return resp.json()
\ No newline at end of file
+    def extract_expires_in(self, body):
+        return self.admin_token_lifetime
@@ -3,6 +3,7 @@ from connectors.base.base_connector import BaseConnector
 from utils.logger import logger
 from connectors.magento.magento_auth import MagentoAuth
 from typing import Optional
+from collections import defaultdict
 
 
 class MagentoConnector(BaseConnector):
@@ -11,8 +12,7 @@ class MagentoConnector(BaseConnector):
         self.auth = MagentoAuth()
         base_url = f"{MAGENTO.BASE_URL}"    
         timeout = MAGENTO.TIMEOUT
-        headers =self.auth.get_headers()
-        super().__init__(base_url, timeout=timeout, headers=headers, verify_ssl=False)
+        super().__init__(base_url, timeout=timeout, verify_ssl=False)
         # self.client = HttpClient(base_url=base_url, headers=headers)
 
     # Public API
@@ -33,6 +33,33 @@ class MagentoConnector(BaseConnector):
 
         return self._request("get", "products", params=params).get("items", [])
 
+    def iter_products(self, page_size: int = 100):
+        """Yield every product, holding only one page of results in memory."""
+        return self._iter_search("products", {"searchCriteria": ""}, page_size)
+
+    def iter_categories(self, page_size: int = 500):
+        """Yield every category, holding only one page of results in memory."""
+        return self._iter_search("categories/list", {}, page_size)
+
+    def _iter_search(self, path: str, params: dict, page_size: int):
+        page = 1
+        seen = 0
+        while True:
+            page_params = {
+                **params,
+                "searchCriteria[currentPage]": page,
+                "searchCriteria[pageSize]": page_size,
+            }
+            resp = self._request("get", path, params=page_params)
+            items = resp.get("items", [])
+            total = resp.get("total_count")
+            yield from items
+            seen += len(items)
+            # Magento keeps returning the last page past the end, so rely on total_count
+            if len(items) < page_size or (total is not None and seen >= total):
+                return
+            page += 1
+
     def get_product(self, sku: str):
         return self._request("get", f"products/{sku}")
     
@@ -94,22 +121,28 @@ class MagentoConnector(BaseConnector):
             if not items:
                 return []
 
+            # children lists are shared with children_by_parent, so a node gets
+            # its children even when they appear before it in items
             node_map = {}
+            parent_of = {}
+            children_by_parent = defaultdict(list)
             for item in items:
-                node_map[item["id"]] = {
-                    "id": item["id"],
+                item_id = item["id"]
+                parent_id = item.get("parent_id")
+                node = {
+                    "id": item_id,
                     "name": item.get("name", "Unnamed Category").strip(),
-                    "children": []
+                    "children": children_by_parent[item_id]
                 }
-
-            tree = []
-            for item in items:
-                node = node_map[item["id"]]
-                parent_id = item.get("parent_id")
-                if parent_id and parent_id in node_map and parent_id != item["id"]:
-                    node_map[parent_id]["children"].append(node)
-                else:
-                    tree.append(node)
+                node_map[item_id] = node
+                parent_of[item_id] = parent_id
+                if parent_id and parent_id != item_id:
+                    children_by_parent[parent_id].append(node)
+
+            tree = [
+                node for node_id, node in node_map.items()
+                if not parent_of[node_id] or parent_of[node_id] not in node_map or parent_of[node_id] == node_id
+            ]
 
             logger.info(f"[Magento] Categories tree built with {len(tree)} root nodes")
             return tree
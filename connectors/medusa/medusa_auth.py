@@ -14,10 +14,8 @@ class MedusaAuth(BaseAuth):
             raise ValueError("Medusa admin credentials missing")
         return {"email": MEDUSA.ADMIN_EMAIL, "password": MEDUSA.ADMIN_PASSWORD}
 
-    def extract_token(self, resp):
-        body = resp.json()
+    def extract_token(self, body):
         return body.get("token")
 
-    def extract_expires_in(self, resp):
-        body = resp.json()
+    def extract_expires_in(self, body):
         return body.get("expires_in")
\ No newline at end of file
@@ -1,20 +1,53 @@
 from config.settings import MEDUSA
 from connectors.base.base_connector import BaseConnector
+from connectors.base.lookup_cache import LookupCache
 from connectors.medusa.medusa_auth import MedusaAuth
 from utils.logger import logger
+import copy
 import secrets
 from datetime import datetime
+from collections import defaultdict, deque
+from itertools import repeat
 
 
 class MedusaConnector(BaseConnector):
 
+    # Page categories by created_at cursor instead of offset. Avoids deep
+    # OFFSET scans on large catalogs but is serial; enable when the backend
+    # supports created_at[$gte] filtering on product-categories.
+    keyset_pagination = False
+
+    # Per-entity endpoint templates, filled with %-formatting
+    _PATHS = {
+        "product_by_sku": "products?variants[sku]=%s",
+        "product_by_id": "products/%s",
+        "customer_by_id": "customers/%s",
+        "customer_addresses": "customers/%s/addresses",
+        "customer_address": "customers/%s/addresses/%s",
+        "customer_invite": "customers/%s/invite",
+        "category_by_id": "product-categories/%s",
+        "order_by_id": "orders/%s",
+        "order_invoices": "orders/%s/invoices",
+        "order_payments": "orders/%s/payments",
+    }
+
+    # get_customer_by_email / get_product_by_sku results, shared between callers
+    lookup_cache_size = 10_000
+    lookup_cache_ttl = 60.0
+
     def __init__(self):
         self.auth = MedusaAuth()
         base_url = f"{MEDUSA.BASE_URL}/admin" 
         timeout = MEDUSA.TIMEOUT
-        headers = self.auth.get_headers()
-        super().__init__(base_url, timeout=timeout, headers=headers)
+        super().__init__(base_url, timeout=timeout)
         # self.client = HttpClient(base_url=base_url, headers=headers)
+        # SKU lookup cache for delete_product_by_sku, kept in sync by
+        # create/delete so bulk deletes skip the variants[sku] query
+        self._sku_index: dict[str, str] = {}
+        self._skus_by_product: dict[str, list[str]] = {}
+        self._customers_by_email = LookupCache(self.lookup_cache_size, self.lookup_cache_ttl)
+        self._products_by_sku = LookupCache(self.lookup_cache_size, self.lookup_cache_ttl)
+        self._email_by_customer: dict[str, str] = {}
 
     def test_connection(self):
         return self._request("get", "products")
@@ -25,39 +58,104 @@ class MedusaConnector(BaseConnector):
         resp = self._request("get", "products", params=params)
         return resp.get("products", [])
       
+    def iter_products(self, page_size: int = 100, prefetch: int = 5):
+        """
+        Yield every product in page order while up to `prefetch` pages are
+        fetched ahead on the connector's pool. Stops after the first short page.
+        """
+        pool = self._get_pool()
+        pending = deque(pool.submit(self.get_products, page, page_size) for page in range(1, prefetch + 1))
+        next_page = prefetch + 1
+        try:
+            while pending:
+                products = pending.popleft().result()
+                yield from products
+                if len(products) < page_size:
+                    return
+                pending.append(pool.submit(self.get_products, next_page, page_size))
+                next_page += 1
+        finally:
+            for future in pending:
+                future.cancel()
+      
     def get_product_by_sku(self, sku: str):
-        return self._request("get", f"products?variants[sku]={sku}")
+        """Look up products by variant SKU; cached briefly, each caller gets its own copy"""
+        return copy.deepcopy(self._products_by_sku.get_or_load(sku, lambda: self._fetch_product_by_sku(sku)))
+
+    def _fetch_product_by_sku(self, sku: str):
+        result = self._request("get", self._PATHS["product_by_sku"] % sku)
+        for product in result.get("products") or []:
+            self._index_product(product)
+        return result
     
     def get_product_by_id(self, id: str):
-        return self._request("get", f"products/{id}")
+        return self._request("get", self._PATHS["product_by_id"] % id)
 
     def create_product(self, data: dict):
         logger.info(f"[Medusa] Creating product with data: {data}")
-        return self._request("post", "products", json=data)
+        result = self._request("post", "products", json=data)
+        # a lookup that missed just before the create must not keep answering "not found"
+        self._invalidate_skus(self._variant_skus(data))
+        self._invalidate_skus(self._index_product(result.get("product") or {}))
+        return result
     
     def update_product(self, product_id: str, data: dict):
-        return self._request("post", f"products/{product_id}", json=data)
+        result = self._request("post", self._PATHS["product_by_id"] % product_id, json=data)
+        self._forget_product_skus(product_id)
+        self._invalidate_skus(self._variant_skus(data))
+        self._invalidate_skus(self._index_product(result.get("product") or {}))
+        return result
 
     def delete_product(self, product_id: str) -> dict:
         logger.info(f"[Medusa] Deleting product with ID: {product_id}")
-        return self._request("delete", f"products/{product_id}")
+        result = self._request("delete", self._PATHS["product_by_id"] % product_id)
+        self._forget_product_skus(product_id)
+        return result
     
     def delete_product_by_sku(self, sku: str) -> dict:
         logger.info(f"[Medusa] Deleting product with SKU: {sku}")
         
-        result = self.get_product_by_sku(sku)
-        products = result.get("products", [])
-        
-        if not products:
-            logger.warning(f"[Medusa] Product with SKU '{sku}' not found")
-            return None
-        
-        product_id = products[0].get("id")
-        if not product_id:
-            logger.error(f"[Medusa] Product found but no ID returned for SKU: {sku}")
-            return None
+        product_id = self._sku_index.get(sku)
+        if product_id is None:
+            result = self.get_product_by_sku(sku)
+            products = result.get("products", [])
+            
+            if not products:
+                logger.warning(f"[Medusa] Product with SKU '{sku}' not found")
+                return None
             
-        return self.delete_product(product_id)
+            product_id = products[0].get("id")
+            if not product_id:
+                logger.error(f"[Medusa] Product found but no ID returned for SKU: {sku}")
+                return None
+            
+        result = self.delete_product(product_id)
+        self._products_by_sku.invalidate(sku)
+        return result
+
+    def _index_product(self, product: dict) -> list[str]:
+        """Record product's variant SKUs in the SKU index; returns them"""
+        product_id = product.get("id")
+        if not product_id:
+            return []
+        skus = self._variant_skus(product)
+        self._skus_by_product[product_id] = skus
+        for sku in skus:
+            self._sku_index[sku] = product_id
+        return skus
+
+    @staticmethod
+    def _variant_skus(product: dict) -> list[str]:
+        return [variant["sku"] for variant in product.get("variants") or [] if variant.get("sku")]
+
+    def _invalidate_skus(self, skus):
+        for sku in skus:
+            self._products_by_sku.invalidate(sku)
+
+    def _forget_product_skus(self, product_id: str):
+        for sku in self._skus_by_product.pop(product_id, ()):
+            self._sku_index.pop(sku, None)
+            self._products_by_sku.invalidate(sku)
 
     def get_customers(self, page: int = 1, page_size: int = 100, email: str = None) -> list[dict]:
         offset = (page - 1) * page_size
@@ -77,36 +175,55 @@ class MedusaConnector(BaseConnector):
             return []
         
     def get_customer(self, customer_id: str) -> dict:
-        return self._request("get", f"customers/{customer_id}")
+        return self._request("get", self._PATHS["customer_by_id"] % customer_id)
     
     def get_customer_by_email(self, email: str) -> dict:
-        customers = self.get_customers(email=email, page_size=1)
-        return customers[0] if customers else None
+        """Return the customer with this email or None; cached briefly, each caller gets its own copy"""
+        try:
+            return copy.deepcopy(self._customers_by_email.get_or_load(email, lambda: self._fetch_customer_by_email(email)))
+        except Exception as e:
+            logger.error(f"Failed to get customers: {e}")
+            return None
+
+    def _fetch_customer_by_email(self, email: str) -> dict:
+        # unlike get_customers, let errors propagate so they are not cached
+        resp = self._request("get", "customers", params={"limit": 1, "offset": 0, "email": email})
+        customers = resp.get("customers") or []
+        customer = customers[0] if customers else None
+        if customer and customer.get("id"):
+            self._email_by_customer[customer["id"]] = email
+        return customer
+
+    def _forget_customer(self, customer_id: str = None, email: str = None):
+        old_email = self._email_by_customer.pop(customer_id, None) if customer_id else None
+        for key in {old_email, email} - {None}:
+            self._customers_by_email.invalidate(key)
 
     def create_customer(self, data: dict):
-        return self._request("post", "customers", json=data)
-    
-    def update_customer(self, customer_id: str, data: dict):
-        return self._request("post", f"customers/{customer_id}", json=data)
+        result = self._request("post", "customers", json=data)
+        self._forget_customer(email=data.get("email"))
+        return result
     
     def add_address(self, customer_id: str, address_data:dict):
-        return self._request("post", f"customers/{customer_id}/addresses", json=address_data)
+        return self._request("post", self._PATHS["customer_addresses"] % customer_id, json=address_data)
     
     def update_address(self, customer_id: str, address_id: str, address_data: dict):
-        return self._request("post", f"customers/{customer_id}/addresses/{address_id}", json=address_data)
+        return self._request("post", self._PATHS["customer_address"] % (customer_id, address_id), json=address_data)
 
     def update_customer(self, customer_id: str, update_data: dict) -> dict:
+        # passwords are stripped by CustomerMapper, the payload is forwarded as is
         logger.info(f"[Medusa] Updating customer: {customer_id}")
-        
-        update_data.pop('password', None)
-        
-        return self._request("post", f"customers/{customer_id}", json=update_data)
+        result = self._request("post", self._PATHS["customer_by_id"] % customer_id, json=update_data)
+        self._forget_customer(customer_id, update_data.get("email"))
+        return result
 
     def delete_customer(self, customer_id: str) -> dict:
         logger.info(f"[Medusa] Deleting customer: {customer_id}")
         
         try:
-            return self._request("delete", f"customers/{customer_id}")
+            result = self._request("delete", self._PATHS["customer_by_id"] % customer_id)
+            self._forget_customer(customer_id)
+            return result
         except Exception as e:
             logger.error(f"[Medusa] Failed to delete customer {customer_id}: {e}")
             raise
@@ -115,7 +232,7 @@ class MedusaConnector(BaseConnector):
         logger.info(f"[Medusa] Sending invite/reset email to customer: {customer_id}")
         
         try:
-            response = self._request("post", f"customers/{customer_id}/invite", json={})
+            response = self._request("post", self._PATHS["customer_invite"] % customer_id, json={})
             logger.info(f"[Medusa] Invite sent successfully to customer: {customer_id}")
             return response
             
@@ -149,42 +266,40 @@ class MedusaConnector(BaseConnector):
         return self._request("post", "product-categories", json=data)
     
     def update_category(self, category_id: str, data: dict):
-        return self._request("post", f"product-categories/{category_id}", json=data)
+        return self._request("post", self._PATHS["category_by_id"] % category_id, json=data)
     
     def delete_category(self, category_id: str) -> dict:
         logger.info(f"[Medusa] Deleting category with ID: {category_id}")
-        return self._request("delete", f"product-categories/{category_id}")
+        return self._request("delete", self._PATHS["category_by_id"] % category_id)
     
     def delete_category_by_name(self, name: str) -> dict:   
         logger.info(f"[Medusa] Deleting category with name: {name}")
         
-        all_categories = self.get_categories()
-        
-        matching_categories = [cat for cat in all_categories if cat.get("name") == name]
+        # filtered server-side; the equality check guards against partial matches
+        matching_categories = [cat for cat in self.get_categories(name=name) if cat.get("name") == name]
         
         if not matching_categories:
             logger.warning(f"[Medusa] Category with name '{name}' not found")
             return None
         
         results = []
-        for category in matching_categories:
+        outcomes = self._delete_categories_concurrently([cat for cat in matching_categories if cat.get("id")])
+        for category, result, error in outcomes:
             category_id = category.get("id")
-            if category_id:
-                try:
-                    result = self.delete_category(category_id)
-                    results.append({
-                        "category_id": category_id,
-                        "name": category.get("name"),
-                        "result": result
-                    })
-                    logger.info(f"[Medusa] Successfully deleted category: {category_id} - {name}")
-                except Exception as e:
-                    logger.error(f"[Medusa] Failed to delete category {category_id}: {str(e)}")
-                    results.append({
-                        "category_id": category_id,
-                        "name": category.get("name"),
-                        "error": str(e)
-                    })
+            if error is None:
+                results.append({
+                    "category_id": category_id,
+                    "name": category.get("name"),
+                    "result": result
+                })
+                logger.info(f"[Medusa] Successfully deleted category: {category_id} - {name}")
+            else:
+                logger.error(f"[Medusa] Failed to delete category {category_id}: {str(error)}")
+                results.append({
+                    "category_id": category_id,
+                    "name": category.get("name"),
+                    "error": str(error)
+                })
         
         return {"deleted_categories": results}
     
@@ -192,79 +307,140 @@ class MedusaConnector(BaseConnector):
         logger.info(f"[Medusa] Deleting category and subcategories for ID: {category_id}")
         
         try:
-            category_info = self._request("get", f"product-categories/{category_id}")
+            category_info = self._request("get", self._PATHS["category_by_id"] % category_id)
         except Exception as e:
             logger.error(f"[Medusa] Failed to get category info for {category_id}: {str(e)}")
             return {"error": f"Failed to get category info: {str(e)}"}
         
-        all_categories = self.get_categories()
-        
-        categories_to_delete = []
-        
-        def find_subcategories(parent_id, category_list):
-            """Tìm đệ quy tất cả danh mục con"""
-            for cat in category_list:
-                if cat.get("parent_category_id") == parent_id:
-                    categories_to_delete.append(cat)
-                    find_subcategories(cat.get("id"), category_list)
-        
+        # group the subtree by depth, level by level from the requested category
+        levels = []
         parent_category = category_info.get("product_category")
         if parent_category:
-            categories_to_delete.append(parent_category)
-            find_subcategories(category_id, all_categories)
-        
-        categories_to_delete.sort(key=lambda x: x.get("parent_category_id") is not None)
-        categories_to_delete.reverse() 
+            # one pass over the catalog builds the parent -> children adjacency
+            children_by_parent = defaultdict(list)
+            for cat in self.get_categories():
+                children_by_parent[cat.get("parent_category_id")].append(cat)
+            
+            level = [parent_category]
+            while level:
+                levels.append(level)
+                level = [child for cat in level for child in children_by_parent.get(cat.get("id"), ())]
         
         results = []
-        for category in categories_to_delete:
-            cat_id = category.get("id")
-            cat_name = category.get("name")
-            try:
-                result = self.delete_category(cat_id)
-                results.append({
-                    "category_id": cat_id,
-                    "name": cat_name,
-                    "status": "success",
-                    "result": result
-                })
-                logger.info(f"[Medusa] Successfully deleted category: {cat_id} - {cat_name}")
-            except Exception as e:
-                logger.error(f"[Medusa] Failed to delete category {cat_id}: {str(e)}")
-                results.append({
-                    "category_id": cat_id,
-                    "name": cat_name,
-                    "status": "failed",
-                    "error": str(e)
-                })
+        # deepest level first so children are gone before their parent;
+        # siblings within a level are deleted concurrently
+        for level in reversed(levels):
+            for category, result, error in self._delete_categories_concurrently(level):
+                cat_id = category.get("id")
+                cat_name = category.get("name")
+                if error is None:
+                    results.append({
+                        "category_id": cat_id,
+                        "name": cat_name,
+                        "status": "success",
+                        "result": result
+                    })
+                    logger.info(f"[Medusa] Successfully deleted category: {cat_id} - {cat_name}")
+                else:
+                    logger.error(f"[Medusa] Failed to delete category {cat_id}: {str(error)}")
+                    results.append({
+                        "category_id": cat_id,
+                        "name": cat_name,
+                        "status": "failed",
+                        "error": str(error)
+                    })
         
         return {"deleted_categories": results}
 
-    def get_categories(self, limit: int = 100) -> list[dict]:
+    def _delete_categories_concurrently(self, categories: list[dict]) -> list[tuple]:
+        """Delete categories in parallel; returns (category, result, error) in input order."""
+        return self._run_concurrently(lambda category: self.delete_category(category.get("id")), categories)
+
+    def _run_concurrently(self, func, items: list) -> list[tuple]:
+        """Call func on each item over the worker pool; returns (item, result, error) in input order."""
+        def run(item):
+            try:
+                return item, func(item), None
+            except Exception as e:
+                return item, None, e
+
+        if len(items) <= 1:
+            return [run(item) for item in items]
+        return list(self._get_pool().map(run, items))
+
+    def get_categories(self, limit: int = 100, name: str = None, handle: str = None) -> list[dict]:
+        filters = {k: v for k, v in {"name": name, "handle": handle}.items() if v is not None}
+        if self.keyset_pagination:
+            return self._get_categories_keyset(limit, filters)
+
+        resp = self._request("get", "product-categories", params={**filters, "limit": limit, "offset": 0})
+        all_categories = list(resp.get("product_categories", []))
+        count = resp.get("count")
+
+        if count is not None:
+            # total is known up front, so fetch the remaining pages concurrently
+            pages = self._get_pool().map(
+                self._get_categories_page, range(limit, count, limit), repeat(limit), repeat(filters)
+            )
+            for categories in pages:
+                all_categories.extend(categories)
+            return all_categories
+
+        all_categories.extend(self._get_remaining_categories(all_categories, limit, filters))
+        return all_categories
+
+    def _get_categories_keyset(self, limit: int, filters: dict = None) -> list[dict]:
         all_categories = []
-        offset = 0
+        cursor = None
+        seen_at_cursor = set()  # ids already returned whose created_at == cursor
 
         while True:
-            params = {"limit": limit, "offset": offset}
+            params = {**(filters or {}), "limit": limit, "order": "created_at"}
+            if cursor:
+                params["created_at[$gte]"] = cursor
             resp = self._request("get", "product-categories", params=params)
             categories = resp.get("product_categories", [])
-            all_categories.extend(categories)
+            new = [cat for cat in categories if cat.get("id") not in seen_at_cursor]
+            all_categories.extend(new)
 
             if len(categories) < limit:
-                break 
+                return all_categories
+            if not new:
+                # a full page shares one created_at value; the cursor cannot advance
+                logger.warning("[Medusa] Keyset pagination stalled, falling back to offset pagination")
+                self.keyset_pagination = False
+                return self.get_categories(limit, **(filters or {}))
+
+            last = categories[-1].get("created_at")
+            if last != cursor:
+                seen_at_cursor = set()
+                cursor = last
+            seen_at_cursor.update(cat.get("id") for cat in new if cat.get("created_at") == cursor)
+
+    def _get_remaining_categories(self, first_page: list[dict], limit: int, filters: dict = None) -> list[dict]:
+        remaining = []
+        offset = limit
+        categories = first_page
+        while len(categories) >= limit:
+            categories = self._get_categories_page(offset, limit, filters)
+            remaining.extend(categories)
             offset += limit
+        return remaining
 
-        return all_categories
+    def _get_categories_page(self, offset: int, limit: int, filters: dict = None) -> list[dict]:
+        params = {**(filters or {}), "limit": limit, "offset": offset}
+        resp = self._request("get", "product-categories", params=params)
+        return resp.get("product_categories", [])
 
     def get_order(self, order_id: str) -> dict:
-        return self._request("get", f"orders/{order_id}")
+        return self._request("get", self._PATHS["order_by_id"] % order_id)
     
     def get_order_invoices(self, order_id: str) -> list[dict]:
-        resp = self._request("get", f"orders/{order_id}/invoices")
+        resp = self._request("get", self._PATHS["order_invoices"] % order_id)
         return resp.get("invoices", [])
     
     def get_order_payments(self, order_id: str) -> list[dict]:
-        resp = self._request("get", f"orders/{order_id}/payments")
+        resp = self._request("get", self._PATHS["order_payments"] % order_id)
         return resp.get("payments", [])
     
     def search_orders(self, params: dict) -> list[dict]:
@@ -278,4 +454,14 @@ class MedusaConnector(BaseConnector):
         return self._request("post", "payments", json=data)
 
     def create_invoice(self, data: dict) -> dict:   
-        return self._request("post", "invoices", json=data)
\ No newline at end of file
+        return self._request("post", "invoices", json=data)
+
+    # The Admin API has no bulk payment/invoice endpoint, so bulk creation
+    # pipelines the single POSTs over the pooled keep-alive connections.
+    def create_payments_bulk(self, items: list[dict]) -> list[tuple]:
+        """Create payments in parallel; returns (payment, result, error) in input order."""
+        return self._run_concurrently(self.create_payment, items)
+
+    def create_invoices_bulk(self, items: list[dict]) -> list[tuple]:
+        """Create invoices in parallel; returns (invoice, result, error) in input order."""
+        return self._run_concurrently(self.create_invoice, items)
\ No newline at end of file
@@ -1,13 +1,85 @@
-import json
+import atexit
 import csv
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator
 from pathlib import Path
 from utils.logger import logger
+from utils import json_utils
+
+# Leading CSV export columns; src_<field> columns follow
+_CSV_BASE_FIELDS = ('entity_type', 'dlq_timestamp', 'operation', 'error')
+
+# DLQ appends are handed to one background writer thread so that callers
+# (including async pipeline steps) never block on disk I/O
+_write_queue: "queue.Queue[tuple]" = queue.Queue()
+_writer_thread = None
+_writer_lock = threading.Lock()
+# Writes that raised, kept so the next flush() of their handler can retry them
+_failed_writes: List[tuple] = []
+
+
+def _drain_writes():
+    while True:
+        filepath, data, count = _write_queue.get()
+        try:
+            with open(filepath, 'ab') as f:
+                f.write(data)
+            logger.info(f"Written {count} items to DLQ: {filepath}")
+        except Exception as e:
+            logger.error(f"Failed to write {count} items to DLQ file {filepath}, keeping them for the next flush: {e}")
+            with _writer_lock:
+                _failed_writes.append((filepath, data, count))
+        finally:
+            _write_queue.task_done()
+
+
+def _submit_write(filepath: Path, data: bytes, count: int):
+    global _writer_thread
+    if _writer_thread is None:
+        with _writer_lock:
+            if _writer_thread is None:
+                _writer_thread = threading.Thread(target=_drain_writes, name="dlq-writer", daemon=True)
+                _writer_thread.start()
+                # don't lose queued items when the process exits
+                atexit.register(_write_queue.join)
+    _write_queue.put((filepath, data, count))
+
+
+def _resubmit_failed_writes(filepath: Path):
+    """Queue the failed writes for filepath again, oldest first"""
+    with _writer_lock:
+        retry = [write for write in _failed_writes if write[0] == filepath]
+        _failed_writes[:] = [write for write in _failed_writes if write[0] != filepath]
+    for write in retry:
+        _submit_write(*write)
+
+
+def wait_for_writes() -> bool:
+    """
+    Block until every queued DLQ write has been attempted
+    
+    Returns:
+        False if any write failed and is still waiting to be retried
+    """
+    if _writer_thread is not None:
+        _write_queue.join()
+    with _writer_lock:
+        return not _failed_writes
 
 
 class DLQHandler:
-    """Dead Letter Queue handler for failed sync items"""
+    """
+    Dead Letter Queue handler for failed sync items
+    
+    Items are appended to ``<entity>.jsonl``, one JSON document per line.
+    Per-batch ``<entity>_<timestamp>.json`` array files written by older
+    versions, and ``<entity>_<timestamp>.jsonl`` files parked by an
+    unfinished retry, are still read.
+    """
     
     def __init__(self, entity_type: str, dlq_dir: str = "dlq"):
         """
@@ -22,6 +94,9 @@ class DLQHandler:
         # Current batch
         self.current_batch: List[Dict] = []
         self.batch_size = 100
+        self._batch_id = None
+        # path -> (inode, size, mtime_ns, item count) from the last get_count
+        self._file_counts: Dict[Path, tuple] = {}
         
     def add_item(self, item: Dict[str, Any]):
         """
@@ -30,143 +105,347 @@ class DLQHandler:
         Args:
             item: Item data including source data and error info
         """
-        # Add metadata
-        item_with_meta = {
-            **item,
-            'dlq_timestamp': datetime.now().isoformat(),
-            'entity_type': self.entity_type,
-            'batch_id': datetime.now().strftime('%Y%m%d_%H%M%S')
-        }
+        self.add_items((item,))
         
-        self.current_batch.append(item_with_meta)
+    def add_items(self, items: List[Dict[str, Any]]):
+        """
+        Add several items to DLQ, stamped with the same timestamp
+        
+        Args:
+            items: Item data including source data and error info
+        """
+        if not items:
+            return
+            
+        now = datetime.now()
+        if not self.current_batch:
+            # every item written in the same batch shares its batch_id
+            self._batch_id = now.strftime('%Y%m%d_%H%M%S')
+            
+        # Add metadata
+        timestamp = now.isoformat()
+        self.current_batch.extend(
+            {
+                **item,
+                'dlq_timestamp': timestamp,
+                'entity_type': self.entity_type,
+                'batch_id': self._batch_id
+            }
+            for item in items
+        )
         
         # Write to file if batch size reached
         if len(self.current_batch) >= self.batch_size:
             self._flush_batch()
             
     def _flush_batch(self):
-        """Write current batch to file"""
+        """Serialize current batch and queue it for appending to the JSONL file"""
         if not self.current_batch:
             return
             
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{self.entity_type}_{timestamp}.json"
-        filepath = self.dlq_dir / filename
-        
+        batch, self.current_batch = self.current_batch, []
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.current_batch, f, indent=2, ensure_ascii=False)
-                
-            logger.info(f"Written {len(self.current_batch)} items to DLQ: {filepath}")
-            self.current_batch = []
-            
+            lines = b''.join(json_utils.dumps(item, default=str) + b'\n' for item in batch)
         except Exception as e:
-            logger.error(f"Failed to write DLQ file: {e}")
+            logger.error(f"Failed to serialize DLQ batch: {e}")
+            self.current_batch = batch + self.current_batch
+            return
             
+        _submit_write(self.jsonl_path, lines, len(batch))
+        
+    def flush(self) -> bool:
+        """
+        Write the current batch, retrying earlier failed writes first, and wait
+        until it is on disk
+        
+        Returns:
+            False if some items could not be written; they are kept for the
+            next flush
+        """
+        _resubmit_failed_writes(self.jsonl_path)
+        self._flush_batch()
+        wait_for_writes()
+        
+        with _writer_lock:
+            pending = sum(count for filepath, _, count in _failed_writes if filepath == self.jsonl_path)
+        if pending:
+            logger.error(f"{pending} {self.entity_type} items are not yet written to the DLQ")
+        return not pending
+        
+    @property
+    def jsonl_path(self) -> Path:
+        """Append-only file receiving new DLQ items"""
+        return self.dlq_dir / f"{self.entity_type}.jsonl"
+        
+    def _files(self) -> List[Path]:
+        """All DLQ files for this entity, oldest first, the live JSONL file last"""
+        wait_for_writes()
+        files = sorted(
+            path for path in self.dlq_dir.glob(f"{self.entity_type}_*.json*")
+            if path.suffix in ('.json', '.jsonl')
+        )
+        if self.jsonl_path.exists():
+            files.append(self.jsonl_path)
+        return files
+        
+    @staticmethod
+    def _iter_file(filepath: Path) -> Iterator[Dict[str, Any]]:
+        if filepath.suffix == '.jsonl':
+            with open(filepath, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        yield json_utils.loads(line)
+        else:
+            yield from json_utils.load_file(filepath)
+            
+    def iter_items(self) -> Iterator[Dict[str, Any]]:
+        """Yield persisted DLQ items, oldest first, one file at a time"""
+        for filepath in self._files():
+            try:
+                yield from self._iter_file(filepath)
+            except Exception as e:
+                logger.warning(f"Failed to read DLQ file {filepath}: {e}")
+                
+    def recent_items(self, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        Return the last `limit` persisted items, oldest first. Files are read
+        newest first and JSONL files from their end, so only the tail is parsed.
+        """
+        items: List[Dict[str, Any]] = []
+        for filepath in reversed(self._files()):
+            needed = limit - len(items)
+            if needed <= 0:
+                break
+            try:
+                if filepath.suffix == '.jsonl':
+                    tail = self._tail_jsonl(filepath, needed)
+                else:
+                    tail = json_utils.load_file(filepath)[-needed:]
+            except Exception as e:
+                logger.warning(f"Failed to read DLQ file {filepath}: {e}")
+                continue
+            items = tail + items
+        return items
+        
+    @staticmethod
+    def _tail_jsonl(filepath: Path, limit: int, block_size: int = 1 << 16) -> List[Dict[str, Any]]:
+        """Parse the last `limit` lines of a JSONL file, reading it backwards in blocks"""
+        with open(filepath, 'rb') as f:
+            pos = f.seek(0, 2)
+            data = b''
+            # limit + 1 newlines guarantee `limit` complete lines after the first one
+            while pos > 0 and data.count(b'\n') <= limit:
+                step = min(block_size, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+                
+        lines = data.splitlines()
+        if pos > 0:
+            # the first line may start before the block that was read
+            lines = lines[1:]
+        lines = [line for line in lines if line.strip()]
+        return [json_utils.loads(line) for line in lines[-limit:]] if limit else []
+        
     def get_count(self) -> int:
         """Get count of items in DLQ for this entity type"""
         count = len(self.current_batch)
         
-        # Count items in existing files
-        pattern = f"{self.entity_type}_*.json"
-        for filepath in self.dlq_dir.glob(pattern):
+        for filepath in self._files():
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    count += len(data)
+                count += self._count_file(filepath)
             except Exception as e:
                 logger.warning(f"Failed to read DLQ file {filepath}: {e}")
                 
         return count
         
+    def _count_file(self, filepath: Path) -> int:
+        """Item count of one file, reading only what changed since the last call"""
+        st = filepath.stat()
+        cached = self._file_counts.get(filepath)
+        if cached and cached[0] == st.st_ino and cached[1:3] == (st.st_size, st.st_mtime_ns):
+            return cached[3]
+            
+        if filepath.suffix == '.jsonl':
+            # one item per line, so count newlines instead of parsing; the
+            # live file only grows, so resume from where the last count ended
+            offset, count = 0, 0
+            if cached and cached[0] == st.st_ino and cached[1] <= st.st_size:
+                offset, count = cached[1], cached[3]
+            with open(filepath, 'rb') as f:
+                f.seek(offset)
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    count += chunk.count(b'\n')
+        else:
+            count = len(json_utils.load_file(filepath))
+            
+        self._file_counts[filepath] = (st.st_ino, st.st_size, st.st_mtime_ns, count)
+        return count
+        
     def export_to_csv(self, output_file: str = None):
-        """Export DLQ items to CSV for manual review"""
+        """
+        Export DLQ items to CSV for manual review
+        
+        Rows are written while the DLQ is read, so memory stays flat. Columns
+        come from the first item; source fields of later items that are not
+        in the header go to a trailing src_extra column as JSON.
+        """
         if not output_file:
             output_file = f"{self.entity_type}_dlq_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
             
         output_path = self.dlq_dir / output_file
         
-        # Collect all items
-        all_items = self.current_batch.copy()
-        pattern = f"{self.entity_type}_*.json"
-        
-        for filepath in self.dlq_dir.glob(pattern):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    all_items.extend(data)
-            except Exception as e:
-                logger.warning(f"Failed to read DLQ file {filepath}: {e}")
-                
-        if not all_items:
+        items = itertools.chain(list(self.current_batch), self.iter_items())
+        first = next(items, None)
+        if first is None:
             logger.info("No items in DLQ to export")
             return
             
-        # Flatten nested structures for CSV
-        flattened_items = []
-        for item in all_items:
-            flat_item = {
-                'entity_type': item.get('entity_type'),
-                'dlq_timestamp': item.get('dlq_timestamp'),
-                'operation': item.get('operation'),
-                'error': item.get('error', ''),
-            }
-            
-            # Add source data fields
-            source_data = item.get('source_data', {})
-            for key, value in source_data.items():
-                if isinstance(value, (str, int, float, bool)):
-                    flat_item[f'src_{key}'] = value
-                else:
-                    flat_item[f'src_{key}'] = str(value)
-                    
-            flattened_items.append(flat_item)
+        source_keys = list((first.get('source_data') or {}).keys())
+        header = [*_CSV_BASE_FIELDS, *(f'src_{key}' for key in source_keys), 'src_extra']
+        known_keys = frozenset(source_keys)
+        
+        def to_row(item):
+            # Flatten nested structures for CSV
+            row = [item.get('entity_type'), item.get('dlq_timestamp'), item.get('operation'), item.get('error', '')]
+            source_data = item.get('source_data') or {}
+            for key in source_keys:
+                value = source_data.get(key)
+                row.append(value if value is None or isinstance(value, (str, int, float, bool)) else str(value))
+            extra = {k: v for k, v in source_data.items() if k not in known_keys}
+            row.append(json_utils.dumps(extra, default=str).decode() if extra else '')
+            return row
             
         # Write CSV
         try:
-            if flattened_items:
-                fieldnames = flattened_items[0].keys()
-                with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(flattened_items)
+            exported = 0
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                for item in itertools.chain((first,), items):
+                    writer.writerow(to_row(item))
+                    exported += 1
                     
-                logger.info(f"Exported {len(flattened_items)} DLQ items to {output_path}")
+            logger.info(f"Exported {exported} DLQ items to {output_path}")
                 
         except Exception as e:
             logger.error(f"Failed to export DLQ to CSV: {e}")
             
-    def retry_failed_items(self, retry_callback):
+    def export_to_json(self, output_file: str) -> int:
+        """
+        Export DLQ items to a single JSON array without parsing them
+        
+        Every JSONL line is already a serialized item, so lines are copied
+        into the output between the outer brackets as raw bytes. Legacy
+        array files contribute the bytes inside their brackets.
+        
+        Args:
+            output_file: Path of the JSON file to write
+            
+        Returns:
+            Number of DLQ files exported
+        """
+        exported_files = 0
+        
+        with open(output_file, 'wb') as out:
+            out.write(b'[')
+            first = True
+            
+            def write(chunk: bytes):
+                nonlocal first
+                if not first:
+                    out.write(b',')
+                out.write(chunk)
+                first = False
+                
+            for item in self.current_batch:
+                write(json_utils.dumps(item, default=str))
+                
+            for filepath in self._files():
+                try:
+                    if filepath.suffix == '.jsonl':
+                        with open(filepath, 'rb') as f:
+                            for line in f:
+                                line = line.strip()
+                                if line:
+                                    write(line)
+                    else:
+                        inner = self._read_array_body(filepath)
+                        if inner is None:
+                            continue
+                        if inner:
+                            write(inner)
+                except OSError as e:
+                    logger.warning(f"Failed to read DLQ file {filepath}: {e}")
+                    continue
+                exported_files += 1
+                
+            out.write(b']')
+            
+        return exported_files
+        
+    @staticmethod
+    def _read_array_body(filepath: Path):
+        """Return the bytes between a DLQ file's outer brackets, or None if malformed"""
+        body = filepath.read_bytes().strip()
+        
+        if not (body.startswith(b'[') and body.endswith(b']')):
+            logger.warning(f"Skipping malformed DLQ file {filepath}")
+            return None
+            
+        return body[1:-1].strip()
+        
+    def retry_failed_items(self, retry_callback, concurrency: int = 8):
         """
         Retry failed items from DLQ
         
         Args:
             retry_callback: Function to call for retrying each item
+            concurrency: Maximum number of items retried at the same time
         """
-        pattern = f"{self.entity_type}_*.json"
         retried_count = 0
         successful_count = 0
         
-        for filepath in self.dlq_dir.glob(pattern):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    items = json.load(f)
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for filepath in self._retry_files():
+                try:
+                    futures = [
+                        executor.submit(retry_callback, item)
+                        for item in self._iter_file(filepath)
+                    ]
+                    retried_count += len(futures)
                     
-                for item in items:
-                    retried_count += 1
-                    try:
-                        retry_callback(item)
-                        successful_count += 1
-                    except Exception as e:
-                        logger.error(f"Retry failed for item: {e}")
-                        
-                # Archive processed file
-                archive_path = self.dlq_dir / 'archive' / filepath.name
-                archive_path.parent.mkdir(exist_ok=True)
-                filepath.rename(archive_path)
-                
-            except Exception as e:
-                logger.error(f"Failed to process DLQ file {filepath}: {e}")
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                            successful_count += 1
+                        except Exception as e:
+                            logger.error(f"Retry failed for item: {e}")
+                            
+                    # Every item of this file has finished, successfully or not
+                    self._archive(filepath)
+                    
+                except Exception as e:
+                    logger.error(f"Failed to process DLQ file {filepath}: {e}")
                 
         logger.info(f"Retried {retried_count} items, {successful_count} successful")
-        return successful_count
\ No newline at end of file
+        return successful_count
+        
+    def _retry_files(self) -> List[Path]:
+        """Park the live file and return every file awaiting retry"""
+        # Park the live file first so failures re-added by retry_callback land
+        # in a fresh JSONL file instead of the one being read
+        wait_for_writes()
+        if self.jsonl_path.exists():
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            self.jsonl_path.rename(self.dlq_dir / f"{self.entity_type}_{timestamp}.jsonl")
+        self._file_counts.clear()
+            
+        return [path for path in self._files() if path != self.jsonl_path]
+        
+    def _archive(self, filepath: Path):
+        """Move a processed DLQ file to the archive directory"""
+        archive_path = self.dlq_dir / 'archive' / filepath.name
+        archive_path.parent.mkdir(exist_ok=True)
+        filepath.rename(archive_path)
+        
\ No newline at end of file
@@ -1,8 +1,18 @@
 from abc import ABC, abstractmethod
+from copy import deepcopy
+from functools import lru_cache
 from typing import Dict, Any
 from pathlib import Path
 import yaml
 from utils.logger import logger
+from utils.yaml_loader import YamlLoader
+
+
+@lru_cache(maxsize=None)
+def _load_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    # mtime_ns is part of the key so an edited mapping file is re-parsed
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=YamlLoader) or {}
 
 
 class MappingBuilder(ABC):
@@ -17,11 +27,13 @@ class MappingBuilder(ABC):
         path = self.base_dir / filename
         logger.info(f"Loading mapping file: {path.resolve()}")
         
-        if not path.exists():
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except FileNotFoundError:
             logger.error(f"Mapping file NOT FOUND: {path.resolve()}")
             return {}
             
-        with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-            logger.info(f"Loaded data from {filename}: {data}")
-            return data
\ No newline at end of file
+        # builders merge into the result, so hand out a copy of the cached parse
+        data = deepcopy(_load_cached(str(path.resolve()), mtime_ns))
+        logger.info(f"Loaded data from {filename}: {data}")
+        return data
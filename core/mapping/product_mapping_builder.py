@@ -11,15 +11,16 @@ class ProductMappingBuilder(MappingBuilder):
 
     @staticmethod
     def deep_merge(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
-        for k, v in b.items():
-            if (
-                k in a
-                and isinstance(a[k], dict)
-                and isinstance(v, dict)
-            ):
-                MappingBuilder.deep_merge(a[k], v)
-            else:
-                a[k] = v
+        """Merge b into a in place (b wins on conflicts); nested dicts are merged key by key."""
+        stack = [(a, b)]
+        while stack:
+            target, source = stack.pop()
+            for k, v in source.items():
+                current = target.get(k)
+                if isinstance(current, dict) and isinstance(v, dict):
+                    stack.append((current, v))
+                else:
+                    target[k] = v
         return a
 
     def _merge(self, base: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
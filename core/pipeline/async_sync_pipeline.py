@@ -1,10 +1,18 @@
 import asyncio
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from graphlib import TopologicalSorter
+from typing import Dict, Any, Optional
 from datetime import datetime
 from utils.logger import logger
 from core.pipeline.pipeline_status import PipelineStatus
 from core.pipeline.pipeline_step import PipelineStep
-from core.pipeline.pipeline import SyncPipeline
+from core.pipeline.sync_pipeline import SyncPipeline
+
+# Worker threads for sync step executors, overridable via config['thread_pool_size']
+DEFAULT_THREAD_POOL_SIZE = 32
+# Steps allowed to run at once, overridable via config['max_concurrency']
+DEFAULT_MAX_CONCURRENCY = 32
 
 
 class AsyncSyncPipeline(SyncPipeline):
@@ -12,6 +20,11 @@ class AsyncSyncPipeline(SyncPipeline):
     Async version of sync pipeline for concurrent execution
     """
     
+    # Pool running sync executors, created per run_async() call
+    _executor: Optional[ThreadPoolExecutor] = None
+    # Bounds running steps; created per run_async() call, inside the event loop
+    _semaphore: Optional[asyncio.Semaphore] = None
+    
     async def run_async(self, dry_run: bool = False) -> Dict[str, Any]:
         """Run pipeline asynchronously"""
         if self.status == PipelineStatus.RUNNING:
@@ -20,19 +33,23 @@ class AsyncSyncPipeline(SyncPipeline):
         logger.info(f"Starting async pipeline: {self.pipeline_id}")
         
         self.status = PipelineStatus.RUNNING
-        self.stats.start_time = datetime.now()
+        self.stats.mark_started()
         self.stats.total_steps = len(self.steps)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.get('thread_pool_size', DEFAULT_THREAD_POOL_SIZE),
+            thread_name_prefix=self.pipeline_id
+        )
+        self._semaphore = asyncio.Semaphore(self.config.get('max_concurrency', DEFAULT_MAX_CONCURRENCY))
         
         try:
             # Validate pipeline
             self._validate_pipeline()
             
             # Execute steps with concurrency
-            await self._execute_steps_concurrently(dry_run)
+            failed = await self._execute_steps_concurrently(dry_run)
             
             # Update pipeline status
-            if all(s.status in [PipelineStatus.COMPLETED, PipelineStatus.PENDING, PipelineStatus.SKIPPED] 
-                   for s in self.steps.values()):
+            if not failed:
                 self.status = PipelineStatus.COMPLETED
                 logger.info("Async pipeline completed successfully")
             else:
@@ -49,7 +66,11 @@ class AsyncSyncPipeline(SyncPipeline):
             })
             
         finally:
-            self.stats.end_time = datetime.now()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            # waiting for the DLQ writer is disk I/O; keep it off the event loop
+            await asyncio.to_thread(self._flush_dlq, wait=True)
+            self.stats.mark_finished()
             self._log_pipeline_summary()
         
         return {
@@ -61,136 +82,100 @@ class AsyncSyncPipeline(SyncPipeline):
             'dry_run': dry_run
         }
     
-    async def _execute_steps_concurrently(self, dry_run: bool):
-        """Execute steps concurrently based on dependencies"""
-        import asyncio
-        
-        # Create task for each step
-        tasks = {}
-        for step_id, step in self.steps.items():
-            if step.enabled:
-                task = asyncio.create_task(
-                    self._execute_step_async(step, dry_run),
-                    name=step_id
-                )
-                tasks[step_id] = task
+    async def _execute_steps_concurrently(self, dry_run: bool) -> int:
+        """
+        Start each step as soon as all of its dependencies are done, so a slow
+        step only holds back its own dependents. Returns the failure count
+        """
+        # _validate_pipeline has already rejected cycles and unknown dependencies
+        sorter = TopologicalSorter(self.dependency_graph)
+        sorter.prepare()
+        in_flight: Dict[asyncio.Task, PipelineStep] = {}
+        failed = 0
         
-        # Wait for tasks to complete with dependency awareness
-        completed = set()
-        
-        while tasks:
-            # Check which tasks can run (dependencies satisfied)
-            ready_tasks = {}
-            for step_id, task in tasks.items():
-                step = self.steps[step_id]
-                dependencies = self.dependency_graph.get(step_id, [])
-                
-                if all(dep in completed for dep in dependencies):
-                    ready_tasks[step_id] = task
-            
-            if not ready_tasks:
-                # No tasks ready, check for deadlock
-                logger.warning("No tasks ready, possible deadlock")
+        while sorter.is_active():
+            # Once a step has failed no new work is started. Skipping a disabled
+            # step can make its dependents ready straight away, hence the loop
+            ready = sorter.get_ready() if not failed else ()
+            while ready:
+                for step_id in ready:
+                    step = self.steps[step_id]
+                    if not step.enabled:
+                        logger.info(f"Skipping disabled step: {step.name}")
+                        self.stats.skipped_steps += 1
+                        sorter.done(step_id)
+                        continue
+                    if self._reuse_cached_result(step, dry_run):
+                        self.stats.completed_steps += 1
+                        sorter.done(step_id)
+                        continue
+                    in_flight[asyncio.create_task(self._execute_step_async(step, dry_run))] = step
+                ready = sorter.get_ready()
+            
+            if not in_flight:
                 break
             
-            # Execute ready tasks concurrently
-            logger.info(f"Executing {len(ready_tasks)} tasks concurrently")
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
             
-            done, pending = await asyncio.wait(
-                ready_tasks.values(),
-                return_when=asyncio.FIRST_COMPLETED
-            )
-            
-            # Process completed tasks
             for task in done:
-                step_id = task.get_name()
-                step = self.steps[step_id]
-                
-                try:
-                    result = await task
-                    self.results[step_id] = result
-                    step.status = PipelineStatus.COMPLETED
-                    completed.add(step_id)
-                    
-                    # Update statistics
-                    if isinstance(result, dict) and 'stats' in result:
-                        stats = result['stats']
-                        self._update_stats_from_result(stats)
-                    
-                    logger.info(f"Task completed: {step.name}")
-                    
-                except Exception as e:
+                step = in_flight.pop(task)
+                error = task.exception()
+                if error is not None:
                     step.status = PipelineStatus.FAILED
-                    step.error = str(e)
+                    step.error = str(error)
+                    failed += 1
                     self.stats.failed_steps += 1
                     
-                    logger.error(f"Task failed: {step.name} - {e}")
+                    logger.error(f"Task failed: {step.name} - {error}")
+                    continue
+                
+                result = task.result()
+                self.results[step.id] = result
+                self._remember_result(step, result)
+                step.status = PipelineStatus.COMPLETED
+                self.stats.completed_steps += 1
+                
+                # Update statistics
+                if isinstance(result, dict) and 'stats' in result:
+                    self._update_stats_from_result(result['stats'])
+                
+                logger.info(f"Task completed: {step.name}")
+                sorter.done(step.id)
             
-            # Remove completed tasks from pending
-            for step_id in list(tasks.keys()):
-                if step_id in completed:
-                    del tasks[step_id]
+            self._flush_dlq()
         
-        # Update step completion counts
-        self.stats.completed_steps = len([s for s in self.steps.values() 
-                                         if s.status == PipelineStatus.COMPLETED])
+        return failed
     
     async def _execute_step_async(self, step: PipelineStep, dry_run: bool):
-        """Execute a step asynchronously"""
-        step.attempts += 1
-        step.start_time = datetime.now()
-        step.status = PipelineStatus.RUNNING
+        """Execute a step asynchronously once a concurrency slot is free"""
+        async with self._semaphore:
+            step.attempts += 1
+            step.mark_started()
+            step.status = PipelineStatus.RUNNING
         
-        logger.info(f"Executing async step: {step.name}")
+            logger.info(f"Executing async step: {step.name}")
         
-        try:
-            # Prepare parameters
-            params = step.params.copy()
-            params['dry_run'] = dry_run
+            try:
+                # Execute step function (convert sync to async if needed)
+                if step.is_async:
+                    result = await step._bound(dry_run=dry_run)
+                else:
+                    # Run sync function in the pipeline's thread pool
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(self._executor, partial(step._bound, dry_run=dry_run))
             
-            # Execute step function (convert sync to async if needed)
-            if asyncio.iscoroutinefunction(step.executor):
-                result = await step.executor(**params)
-            else:
-                # Run sync function in thread pool
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(
-                    None, 
-                    lambda: step.executor(**params)
-                )
-            
-            step.end_time = datetime.now()
+                duration = step.mark_finished()
+                logger.info(f"Async step completed: {step.name} ({duration:.2f}s)")
             
-            duration = (step.end_time - step.start_time).total_seconds()
-            logger.info(f"Async step completed: {step.name} ({duration:.2f}s)")
+                return result
             
-            return result
+            except Exception as e:
+                step.status = PipelineStatus.FAILED
+                duration = step.mark_finished()
+                step.error = str(e)
             
-        except Exception as e:
-            step.status = PipelineStatus.FAILED
-            step.end_time = datetime.now()
-            step.error = str(e)
+                logger.error(f"Async step failed: {step.name} ({duration:.2f}s) - {e}")
             
-            duration = (step.end_time - step.start_time).total_seconds()
-            logger.error(f"Async step failed: {step.name} ({duration:.2f}s) - {e}")
+                self._record_step_failure(step, e)
             
-            # Add to DLQ
-            self.dlq.add_item({
-                'pipeline_id': self.pipeline_id,
-                'step_id': step.id,
-                'step_name': step.name,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat(),
-                'attempt': step.attempts
-            })
-            
-            raise
-    
-    def _update_stats_from_result(self, result_stats: Dict[str, Any]):
-        """Update pipeline stats from step result"""
-        if 'total_processed' in result_stats:
-            self.stats.total_items_processed += result_stats['total_processed']
-        if 'successful' in result_stats:
-            self.stats.successful_items += result_stats['successful']
-        if 'failed' in result_stats:
-            self.stats.failed_items += result_stats['failed']
\ No newline at end of file
+                raise
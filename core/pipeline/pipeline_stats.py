@@ -1,8 +1,9 @@
 from typing import Dict, Optional, Any
-from datetime import datetime
-from dataclasses import dataclass
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+import time
 
-@dataclass
+@dataclass(slots=True)
 class PipelineStats:
     """Pipeline statistics"""
     total_steps: int = 0
@@ -14,10 +15,35 @@ class PipelineStats:
     failed_items: int = 0
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
+    _started_at: Optional[float] = field(default=None, init=False, repr=False)
+    _elapsed: Optional[float] = field(default=None, init=False, repr=False)
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any):
+        # any field write invalidates the cached to_dict() snapshot
+        object.__setattr__(self, name, value)
+        if name != '_dict_cache':
+            object.__setattr__(self, '_dict_cache', None)
+    
+    def mark_started(self):
+        self.start_time = datetime.now()
+        self._started_at = time.monotonic()
+        self._elapsed = None
+    
+    def mark_finished(self):
+        if self._started_at is None:
+            self.end_time = datetime.now()
+            return
+        self._elapsed = time.monotonic() - self._started_at
+        self.end_time = self.start_time + timedelta(seconds=self._elapsed)
     
     @property
     def duration(self) -> Optional[float]:
         """Get pipeline duration in seconds"""
+        if self._elapsed is not None:
+            return self._elapsed
+        if self._started_at is not None:
+            return time.monotonic() - self._started_at
         if self.start_time and self.end_time:
             return (self.end_time - self.start_time).total_seconds()
         elif self.start_time:
@@ -32,8 +58,17 @@ class PipelineStats:
         return (self.successful_items / self.total_items_processed) * 100
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
+        """
+        Convert to dictionary. Once the duration no longer depends on the
+        clock (not started, or finished) the values are cached until the next
+        field write; every caller gets its own copy, so mutating the result
+        cannot leak into later snapshots.
+        """
+        if self._dict_cache is not None:
+            # all values are scalars or None, so a shallow copy is a full copy
+            return dict(self._dict_cache)
+        
+        data = {
             'total_steps': self.total_steps,
             'completed_steps': self.completed_steps,
             'failed_steps': self.failed_steps,
@@ -45,4 +80,8 @@ class PipelineStats:
             'end_time': self.end_time.isoformat() if self.end_time else None,
             'duration': self.duration,
             'success_rate': self.success_rate
-        }
\ No newline at end of file
+        }
+        if self._elapsed is not None or (self._started_at is None and
+                                         (self.start_time is None or self.end_time is not None)):
+            self._dict_cache = dict(data)
+        return data
@@ -1,9 +1,12 @@
 from typing import Dict, List, Optional, Any, Callable
-from datetime import datetime
+from datetime import datetime, timedelta
+import inspect
+import time
 from dataclasses import dataclass, field
+from functools import partial
 from core.pipeline.pipeline_status import PipelineStatus
 
-@dataclass
+@dataclass(slots=True)
 class PipelineStep:
     """Pipeline step configuration"""
     name: str
@@ -11,13 +14,42 @@ class PipelineStep:
     depends_on: List[str] = field(default_factory=list)
     timeout: int = 300  # 5 minutes default
     retries: int = 3
+    backoff_cap: float = 60.0  # max seconds between attempts
+    jitter_mode: str = "full"  # "full", "decorrelated" or "none"
     enabled: bool = True
     params: Dict[str, Any] = field(default_factory=dict)
+    cacheable: bool = False  # reuse the last result while executor, params and upstream results are unchanged
+    cache_key_fn: Optional[Callable] = None  # step -> JSON-able key material, defaults to params
+    
+    # Runtime state, declared as fields so that slots covers them
+    id: str = field(init=False, default="")
+    status: PipelineStatus = field(init=False, default=PipelineStatus.PENDING)
+    start_time: Optional[datetime] = field(init=False, default=None)
+    end_time: Optional[datetime] = field(init=False, default=None)
+    error: Optional[str] = field(init=False, default=None)
+    attempts: int = field(init=False, default=0)
+    last_backoff: float = field(init=False, default=0.0)
+    duration: Optional[float] = field(init=False, default=None)
+    _started_at: float = field(init=False, default=0.0, repr=False)  # time.monotonic() of the current attempt
+    _bound: Optional[Callable] = field(init=False, default=None, repr=False)
+    is_async: bool = field(init=False, default=False)  # executor is a coroutine function
+    _cache_key: Optional[str] = field(init=False, default=None, repr=False)  # input hash of the current run
     
     def __post_init__(self):
         self.id = f"step_{self.name.lower().replace(' ', '_')}"
-        self.status = PipelineStatus.PENDING
-        self.start_time: Optional[datetime] = None
-        self.end_time: Optional[datetime] = None
-        self.error: Optional[str] = None
-        self.attempts: int = 0
\ No newline at end of file
+        # executor with params bound once; callers only pass dry_run
+        self._bound = partial(self.executor, **self.params)
+        # inspect looks through functools.partial wrappers; decided once, not per attempt
+        self.is_async = inspect.iscoroutinefunction(self.executor)
+    
+    def mark_started(self):
+        """Stamp the start of an attempt"""
+        self.start_time = datetime.now()
+        self._started_at = time.monotonic()
+    
+    def mark_finished(self) -> float:
+        """Stamp the end of an attempt; returns its duration in seconds"""
+        # derive end_time from the monotonic clock rather than reading the wall clock again
+        self.duration = time.monotonic() - self._started_at
+        self.end_time = self.start_time + timedelta(seconds=self.duration)
+        return self.duration
\ No newline at end of file
@@ -0,0 +1,76 @@
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+from utils.logger import logger
+
+# Results of cacheable steps, keyed by the hash of their inputs
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'magento_medusa' / 'steps'
+
+
+class StepResultCache:
+    """
+    Results of cacheable pipeline steps keyed by a causal hash of the step's
+    inputs. Recent results are kept in an in-memory LRU; when a directory is
+    given they are also pickled there so a restarted process can reuse them.
+    """
+
+    def __init__(self, maxsize: int = 32, directory: Optional[Union[str, Path]] = DEFAULT_CACHE_DIR):
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory else None
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (hit, result) for key"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return True, self._memory[key]
+
+        if self.directory is None:
+            return False, None
+
+        try:
+            with open(self.directory / f"{key}.pkl", 'rb') as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable step cache entry {key}: {e}")
+            return False, None
+
+        self._remember(key, result)
+        return True, result
+
+    def put(self, key: str, result: Any):
+        """Store result under key"""
+        self._remember(key, result)
+
+        if self.directory is None:
+            return
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.directory / f"{key}.pkl.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(self.directory / f"{key}.pkl")
+        except Exception as e:
+            logger.warning(f"Could not persist step cache entry {key}: {e}")
+
+    def clear(self):
+        """Drop all cached results, including the on-disk copies"""
+        with self._lock:
+            self._memory.clear()
+        if self.directory is not None and self.directory.exists():
+            for path in self.directory.glob('*.pkl'):
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, result: Any):
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
@@ -1,8 +1,15 @@
 from typing import Dict, List, Optional, Any, Callable
+from dataclasses import fields
 from datetime import datetime
-import time
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import json
+import pickle
+import random
+import threading
+import time
 from utils.logger import logger
+from utils import json_utils
 from core.dlq_handler import DLQHandler
 from core.validator import Validator
 from core.transformer import Transformer
@@ -11,7 +18,16 @@ from connectors.medusa.medusa_connector import MedusaConnector
 from core.pipeline.pipeline_status import PipelineStatus
 from core.pipeline.pipeline_stats import PipelineStats
 from core.pipeline.pipeline_step import PipelineStep
+from core.pipeline.step_cache import StepResultCache, DEFAULT_CACHE_DIR
 from services.category_sync_service import CategorySyncService
+from services.product_sync_service import ProductSyncService
+from services.customer_sync_service import CustomerSyncService
+
+# Base delay in seconds for step retry backoff
+RETRY_BASE_DELAY = 1.0
+
+# Steps whose failure stops the whole pipeline
+CRITICAL_STEPS = frozenset({'step_test_connections', 'step_sync_categories'})
 
 
 class SyncPipeline:
@@ -45,6 +61,14 @@ class SyncPipeline:
         self.validator = Validator()
         self.transformer = Transformer()
         self.dlq = DLQHandler('pipeline')
+        self._dlq_handlers: Dict[str, DLQHandler] = {'pipeline': self.dlq}
+        # Step failures waiting to be handed to the DLQ at the end of a wave
+        self._dlq_buffer: List[Dict[str, Any]] = []
+        # Sync services, built on first use and kept for retries and later runs
+        self._services: Dict[str, Any] = {}
+        # Results of cacheable steps, and digests of step results feeding their keys
+        self.step_cache = StepResultCache(directory=self.config.get('step_cache_dir', DEFAULT_CACHE_DIR))
+        self._result_hashes: Dict[str, bytes] = {}
         
         # Pipeline state
         self.steps: Dict[str, PipelineStep] = {}
@@ -55,6 +79,15 @@ class SyncPipeline:
         
         # Dependencies
         self.dependency_graph: Dict[str, List[str]] = {}
+        # Reverse index: step -> steps depending on it
+        self.dependents: Dict[str, List[str]] = {}
+        # Steps grouped by dependency depth, computed by _validate_pipeline
+        self._levels: List[List[str]] = []
+        # Fingerprint of the last graph that passed _validate_pipeline
+        self._validated_fingerprint: Optional[int] = None
+        
+        # Guards stats/DLQ updates made by concurrently running steps
+        self._lock = threading.Lock()
         
         # Callbacks
         self.on_step_start: Optional[Callable] = None
@@ -77,6 +110,9 @@ class SyncPipeline:
         
         self.steps[step.id] = step
         self.dependency_graph[step.id] = step.depends_on
+        for dep in step.depends_on:
+            self.dependents.setdefault(dep, []).append(step.id)
+        self._validated_fingerprint = None
         
         logger.debug(f"Added step: {step.name} (ID: {step.id})")
     
@@ -143,73 +179,50 @@ class SyncPipeline:
         logger.info(f"Dry run mode: {dry_run}")
         
         self.status = PipelineStatus.RUNNING
-        self.stats.start_time = datetime.now()
+        self.stats.mark_started()
         self.stats.total_steps = len(self.steps)
         
         try:
             # Validate pipeline configuration
             self._validate_pipeline()
             
-            # Execute steps in dependency order
-            executed_steps = set()
-            
-            while len(executed_steps) < len(self.steps):
-                # Find ready steps (dependencies satisfied)
-                ready_steps = self._get_ready_steps(executed_steps)
-                
-                if not ready_steps:
-                    # Check for circular dependencies or unmet dependencies
-                    unresolved = self._find_unresolved_dependencies(executed_steps)
-                    if unresolved:
-                        raise RuntimeError(f"Unresolved dependencies: {unresolved}")
-                    break
-                
-                # Execute ready steps
-                for step_id in ready_steps:
+            # Execute steps level by level in dependency order
+            failed = 0
+            for level in self._levels:
+                runnable = []
+                for step_id in level:
                     step = self.steps[step_id]
                     
                     if not step.enabled:
                         logger.info(f"Skipping disabled step: {step.name}")
                         step.status = PipelineStatus.PENDING
                         self.stats.skipped_steps += 1
-                        executed_steps.add(step_id)
                         continue
                     
-                    # Execute step
-                    success = self._execute_step(step, dry_run)
+                    if self._reuse_cached_result(step, dry_run):
+                        self.stats.completed_steps += 1
+                        continue
                     
+                    runnable.append(step)
+                
+                # Steps of a level don't depend on each other, so run them concurrently
+                for step, success in zip(runnable, self._execute_wave(runnable, dry_run)):
                     if success:
-                        executed_steps.add(step_id)
                         self.stats.completed_steps += 1
                     else:
+                        # Step failed after retries
+                        failed += 1
                         self.stats.failed_steps += 1
-                        
-                        # Check if step should be retried
-                        if step.attempts < step.retries:
-                            logger.info(f"Retrying step {step.name} (attempt {step.attempts + 1}/{step.retries})")
-                            time.sleep(2 ** step.attempts)  # Exponential backoff
-                            success = self._execute_step(step, dry_run)
-                            
-                            if success:
-                                executed_steps.add(step_id)
-                                self.stats.completed_steps += 1
-                                self.stats.failed_steps -= 1
-                            else:
-                                # Step failed after retries
-                                self._handle_step_failure(step)
-                                break
-                        else:
-                            # Step failed after max retries
-                            self._handle_step_failure(step)
-                            break
+                        self._handle_step_failure(step)
+                
+                self._flush_dlq()
                 
                 # If any step failed, stop pipeline
-                if any(s.status == PipelineStatus.FAILED for s in self.steps.values()):
+                if failed:
                     break
             
-            # Update pipeline status
-            if all(s.status in [PipelineStatus.COMPLETED, PipelineStatus.PENDING, PipelineStatus.SKIPPED] 
-                   for s in self.steps.values()):
+            # Update pipeline status; steps never reached stay PENDING
+            if not failed:
                 self.status = PipelineStatus.COMPLETED
                 logger.info("Pipeline completed successfully")
                 
@@ -240,7 +253,8 @@ class SyncPipeline:
                 self.on_pipeline_failed(self)
                 
         finally:
-            self.stats.end_time = datetime.now()
+            self._flush_dlq(wait=True)
+            self.stats.mark_finished()
             self._log_pipeline_summary()
         
         return {
@@ -252,10 +266,123 @@ class SyncPipeline:
             'dry_run': dry_run
         }
     
+    def _execute_wave(self, steps: List[PipelineStep], dry_run: bool) -> List[bool]:
+        """Execute independent steps concurrently; returns their results in order"""
+        if len(steps) <= 1:
+            return [self._execute_step(step, dry_run) for step in steps]
+        
+        logger.info(f"Executing {len(steps)} steps concurrently")
+        with ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix=self.pipeline_id) as pool:
+            return list(pool.map(lambda step: self._execute_step(step, dry_run), steps))
+    
     def _execute_step(self, step: PipelineStep, dry_run: bool) -> bool:
-        """Execute a single pipeline step"""
+        """Execute a pipeline step, retrying it up to step.retries times"""
+        for attempt in range(step.retries + 1):
+            if attempt:
+                step.status = PipelineStatus.RETRYING
+                logger.info(f"Retrying step {step.name} (attempt {attempt + 1}/{step.retries + 1})")
+                time.sleep(self._retry_delay(step))  # Exponential backoff with jitter
+            
+            error = self._attempt_step(step, dry_run)
+            if error is None:
+                return True
+        
+        self._record_step_failure(step, error)
+        
+        if self.on_step_failed:
+            self.on_step_failed(step, error)
+        
+        return False
+    
+    def _record_step_failure(self, step: PipelineStep, error: Exception):
+        """Add a step's final failure to the errors list and the DLQ buffer"""
+        # the step has just been marked finished; reuse that instant
+        failed_at = step.end_time or datetime.now()
+        entry = {
+            'step_id': step.id,
+            'step_name': step.name,
+            'timestamp': failed_at.isoformat(),
+            'error': str(error),
+            'attempt': step.attempts,
+            'duration': step.duration
+        }
+        
+        with self._lock:
+            self.errors.append(entry)
+            self._dlq_buffer.append({'pipeline_id': self.pipeline_id, **entry})
+    
+    def _reuse_cached_result(self, step: PipelineStep, dry_run: bool) -> bool:
+        """
+        For a cacheable step whose inputs are unchanged since a previous run,
+        restore that run's result instead of executing it. Returns True on a hit.
+        """
+        step._cache_key = self._step_cache_key(step, dry_run) if step.cacheable else None
+        if step._cache_key is None:
+            return False
+        
+        hit, result = self.step_cache.get(step._cache_key)
+        if not hit:
+            return False
+        
+        self.results[step.id] = result
+        self._result_hashes.pop(step.id, None)
+        step.status = PipelineStatus.COMPLETED
+        step.error = None
+        logger.info(f"Step {step.name} inputs unchanged, reusing cached result")
+        
+        if self.on_step_complete:
+            self.on_step_complete(step, result)
+        return True
+    
+    def _remember_result(self, step: PipelineStep, result: Any):
+        """Record a fresh step result: drop its stale digest and cache it if the step is cacheable"""
+        self._result_hashes.pop(step.id, None)
+        if step._cache_key is not None:
+            self.step_cache.put(step._cache_key, result)
+    
+    def _step_cache_key(self, step: PipelineStep, dry_run: bool) -> Optional[str]:
+        """Causal hash of executor, params and upstream results; None if they can't be hashed"""
+        executor = step.executor
+        material = step.cache_key_fn(step) if step.cache_key_fn else step.params
+        
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{getattr(executor, '__module__', '')}.{getattr(executor, '__qualname__', repr(executor))}".encode())
+        try:
+            h.update(json.dumps({'key': material, 'dry_run': dry_run}, sort_keys=True, default=str).encode())
+            for dep in sorted(self.dependency_graph[step.id]):
+                h.update(self._result_digest(dep))
+        except (TypeError, ValueError, pickle.PicklingError, AttributeError) as e:
+            logger.warning(f"Step {step.name} inputs can't be hashed, running it uncached: {e}")
+            return None
+        return h.hexdigest()
+    
+    def _result_digest(self, step_id: str) -> bytes:
+        digest = self._result_hashes.get(step_id)
+        if digest is None:
+            payload = pickle.dumps(self.results.get(step_id), protocol=pickle.HIGHEST_PROTOCOL)
+            digest = self._result_hashes[step_id] = hashlib.blake2b(payload, digest_size=16).digest()
+        return digest
+    
+    def _flush_dlq(self, wait: bool = False):
+        """
+        Hand buffered step failures to the DLQ in one batch and queue them for
+        the background writer. With wait=True (end of run) block until every
+        queued write is on disk.
+        """
+        with self._lock:
+            buffer, self._dlq_buffer = self._dlq_buffer, []
+        
+        if buffer:
+            self.dlq.add_items(buffer)
+        if wait:
+            self.dlq.flush()
+        else:
+            self.dlq._flush_batch()
+    
+    def _attempt_step(self, step: PipelineStep, dry_run: bool) -> Optional[Exception]:
+        """Run a step once; returns the error if it failed"""
         step.attempts += 1
-        step.start_time = datetime.now()
+        step.mark_started()
         step.status = PipelineStatus.RUNNING
         
         logger.info(f"Executing step: {step.name}")
@@ -264,111 +391,99 @@ class SyncPipeline:
             self.on_step_start(step)
         
         try:
-            # Prepare parameters
-            params = step.params.copy()
-            params['dry_run'] = dry_run
-            
             # Execute step function
-            result = step.executor(**params)
-            
-            # Store result
-            self.results[step.id] = result
-            
-            # Update step status
-            
-            step.status = PipelineStatus.COMPLETED
-            step.end_time = datetime.now()
-            
-            # Update statistics
-            if isinstance(result, dict) and 'stats' in result:
-                stats = result['stats']
-                if 'total_processed' in stats:
-                    self.stats.total_items_processed += stats['total_processed']
-                if 'successful' in stats:
-                    self.stats.successful_items += stats['successful']
-                if 'failed' in stats:
-                    self.stats.failed_items += stats['failed']
-            
-            duration = (step.end_time - step.start_time).total_seconds()
-            logger.info(f"Step completed: {step.name} ({duration:.2f}s)")
-            
-            if self.on_step_complete:
-                self.on_step_complete(step, result)
-            
-            return True
+            result = step._bound(dry_run=dry_run)
             
         except Exception as e:
             step.status = PipelineStatus.FAILED
-            step.end_time = datetime.now()
+            duration = step.mark_finished()
             step.error = str(e)
             
-            duration = (step.end_time - step.start_time).total_seconds()
             logger.error(f"Step failed: {step.name} ({duration:.2f}s) - {e}")
             
-            # Add to errors list
-            self.errors.append({
-                'step_id': step.id,
-                'step_name': step.name,
-                'timestamp': datetime.now().isoformat(),
-                'error': str(e),
-                'attempt': step.attempts,
-                'duration': duration
-            })
-            
-            # Add to DLQ
-            self.dlq.add_item({
-                'pipeline_id': self.pipeline_id,
-                'step_id': step.id,
-                'step_name': step.name,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat(),
-                'attempt': step.attempts
-            })
-            
-            if self.on_step_failed:
-                self.on_step_failed(step, e)
-            
-            return False
-    
-    def _get_ready_steps(self, executed_steps: set) -> List[str]:
-        """Get steps that are ready to execute (dependencies satisfied)"""
-        ready_steps = []
+            return e
         
-        for step_id, step in self.steps.items():
-            if step_id in executed_steps:
-                continue
-            
-            # Check if all dependencies are satisfied
-            dependencies = self.dependency_graph.get(step_id, [])
-            if all(dep in executed_steps for dep in dependencies):
-                ready_steps.append(step_id)
+        # Store result
+        self.results[step.id] = result
+        self._remember_result(step, result)
         
-        # Sort by dependency depth (optional)
-        ready_steps.sort(key=lambda x: len(self.dependency_graph.get(x, [])))
+        # Update step status
+        step.status = PipelineStatus.COMPLETED
+        duration = step.mark_finished()
+        step.error = None
         
-        return ready_steps
-    
-    def _find_unresolved_dependencies(self, executed_steps: set) -> List[str]:
-        """Find steps with unresolved dependencies"""
-        unresolved = []
+        # Update statistics
+        if isinstance(result, dict) and 'stats' in result:
+            self._update_stats_from_result(result['stats'])
         
-        for step_id, step in self.steps.items():
-            if step_id in executed_steps:
-                continue
-            
-            dependencies = self.dependency_graph.get(step_id, [])
-            missing = [dep for dep in dependencies if dep not in executed_steps]
-            
-            if missing:
-                unresolved.append(f"{step_id} -> {missing}")
+        logger.info(f"Step completed: {step.name} ({duration:.2f}s)")
+        
+        if self.on_step_complete:
+            self.on_step_complete(step, result)
         
-        return unresolved
+        return None
+    
+    def _retry_delay(self, step: PipelineStep) -> float:
+        """
+        Seconds to wait before retrying step. "full" jitter picks a random
+        delay up to the exponential backoff so that pipelines retrying against
+        the same API don't synchronize; "decorrelated" grows from the previous
+        delay; "none" is plain exponential backoff.
+        """
+        if step.jitter_mode == "decorrelated":
+            previous = step.last_backoff or RETRY_BASE_DELAY
+            delay = min(step.backoff_cap, random.uniform(RETRY_BASE_DELAY, previous * 3))
+        else:
+            ceiling = min(step.backoff_cap, RETRY_BASE_DELAY * 2 ** step.attempts)
+            delay = ceiling if step.jitter_mode == "none" else random.uniform(0, ceiling)
+        
+        step.last_backoff = delay
+        return delay
+    
+    def _update_stats_from_result(self, result_stats: Dict[str, Any]):
+        """Update pipeline stats from step result"""
+        with self._lock:
+            if 'total_processed' in result_stats:
+                self.stats.total_items_processed += result_stats['total_processed']
+            if 'successful' in result_stats:
+                self.stats.successful_items += result_stats['successful']
+            if 'failed' in result_stats:
+                self.stats.failed_items += result_stats['failed']
+    
+    def _compute_levels(self) -> List[List[str]]:
+        """
+        Group steps into levels with Kahn's algorithm: level 0 has no
+        dependencies and every step's dependencies sit in earlier levels.
+        Steps on a cycle never reach indegree 0 and are left out.
+        """
+        indegree = {step_id: len(deps) for step_id, deps in self.dependency_graph.items()}
+        level = [step_id for step_id, count in indegree.items() if count == 0]
+        levels = []
+        
+        while level:
+            levels.append(level)
+            next_level = []
+            for step_id in level:
+                for dependent in self.dependents.get(step_id, ()):
+                    indegree[dependent] -= 1
+                    if indegree[dependent] == 0:
+                        next_level.append(dependent)
+            level = next_level
+        
+        return levels
+    
+    def _graph_fingerprint(self) -> int:
+        return hash(tuple(sorted(
+            (step_id, tuple(sorted(deps))) for step_id, deps in self.dependency_graph.items()
+        )))
     
     def _validate_pipeline(self):
         """Validate pipeline configuration"""
-        # Check for circular dependencies
-        if self._has_circular_dependencies():
-            raise ValueError("Pipeline has circular dependencies")
+        # The graph only changes through add_step, so skip re-validating on
+        # repeated run()/resume() calls
+        fingerprint = self._graph_fingerprint()
+        if fingerprint == self._validated_fingerprint:
+            return
         
         # Check that all step IDs referenced in dependencies exist
         for step_id, dependencies in self.dependency_graph.items():
@@ -376,41 +491,25 @@ class SyncPipeline:
                 if dep not in self.steps:
                     raise ValueError(f"Dependency {dep} referenced by {step_id} does not exist")
         
-        logger.info("Pipeline validation passed")
-    
-    def _has_circular_dependencies(self) -> bool:
-        """Check for circular dependencies using DFS"""
-        visited = set()
-        recursion_stack = set()
-        
-        def dfs(node):
-            visited.add(node)
-            recursion_stack.add(node)
-            
-            for neighbor in self.dependency_graph.get(node, []):
-                if neighbor not in visited:
-                    if dfs(neighbor):
-                        return True
-                elif neighbor in recursion_stack:
-                    return True
-            
-            recursion_stack.remove(node)
-            return False
-        
-        for step_id in self.steps:
-            if step_id not in visited:
-                if dfs(step_id):
-                    return True
-        
-        return False
+        # Steps Kahn's algorithm cannot place sit on, or behind, a cycle
+        levels = self._compute_levels()
+        placed = sum(len(level) for level in levels)
+        if placed < len(self.steps):
+            level_steps = {step_id for level in levels for step_id in level}
+            blocked = [step_id for step_id in self.steps if step_id not in level_steps]
+            raise ValueError(f"Pipeline has circular dependencies involving: {', '.join(blocked)}")
+        
+        self._levels = levels
+        self._validated_fingerprint = fingerprint
+        # the number of levels is the length of the critical path
+        logger.info(f"Pipeline validation passed ({len(self._levels)} levels)")
     
     def _handle_step_failure(self, step: PipelineStep):
         """Handle step failure"""
         logger.error(f"Step {step.name} failed after {step.retries} retries")
         
         # Determine if pipeline should continue
-        critical_steps = ['step_test_connections', 'step_sync_categories']
-        if step.id in critical_steps:
+        if step.id in CRITICAL_STEPS:
             logger.error(f"Critical step failed, stopping pipeline")
             self.status = PipelineStatus.FAILED
         else:
@@ -432,22 +531,36 @@ class SyncPipeline:
                 }
                 for step_id, step in self.steps.items()
             },
-            'results': self.results,
+            'results': self._results_for_state(),
             'stats': self.stats.to_dict(),
             'timestamp': datetime.now().isoformat()
         }
         
         # Save state to file
-        import json
         state_file = f"pipeline_state_{self.pipeline_id}.json"
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        json_utils.dump_file(state, state_file, indent=False, default=str)
         
         logger.info(f"Pipeline state saved to {state_file}")
     
+    def _results_for_state(self) -> Dict[str, Any]:
+        """
+        Step results trimmed for the resume state file: per-step stats and the
+        category mapping product sync needs. Full executor payloads (product
+        lists, reports) are left out since resume() re-runs the steps anyway.
+        """
+        state_results = {}
+        for key, result in self.results.items():
+            if key == 'category_mapping':
+                state_results[key] = result
+            elif isinstance(result, dict) and 'stats' in result:
+                state_results[key] = {'stats': result['stats']}
+        return state_results
+    
     def _log_pipeline_summary(self):
         """Log pipeline summary"""
-        duration = self.stats.duration
+        # computed once for the finished run; the return value's to_dict() hits the cache
+        stats = self.stats.to_dict()
+        duration = stats['duration']
         if duration:
             duration_str = f"{duration:.2f}s"
         else:
@@ -459,32 +572,29 @@ class SyncPipeline:
         logger.info(f"Pipeline ID: {self.pipeline_id}")
         logger.info(f"Status: {self.status.value}")
         logger.info(f"Duration: {duration_str}")
-        logger.info(f"Steps: {self.stats.completed_steps}/{self.stats.total_steps} completed")
-        logger.info(f"Items: {self.stats.successful_items} successful, "
-                   f"{self.stats.failed_items} failed")
-        logger.info(f"Success Rate: {self.stats.success_rate:.2f}%")
+        logger.info(f"Steps: {stats['completed_steps']}/{stats['total_steps']} completed")
+        logger.info(f"Items: {stats['successful_items']} successful, "
+                   f"{stats['failed_items']} failed")
+        logger.info(f"Success Rate: {stats['success_rate']:.2f}%")
         logger.info("=" * 70)
         
         # Log step details
         for step_id, step in self.steps.items():
-            if step.start_time and step.end_time:
-                step_duration = (step.end_time - step.start_time).total_seconds()
-                logger.info(f"  {step.name}: {step.status.value} ({step_duration:.2f}s)")
+            if step.duration is not None:
+                logger.info(f"  {step.name}: {step.status.value} ({step.duration:.2f}s)")
             else:
                 logger.info(f"  {step.name}: {step.status.value}")
     
     # Step execution methods
-    def _test_connections(self, **kwargs) -> Dict[str, Any]:
+    def _test_connections(self, dry_run: bool = False) -> Dict[str, Any]:
         """Test connections to Magento and Medusa"""
-        dry_run = kwargs.get('dry_run', False)
-        
         logger.info("Testing connections...")
         
         results = {}
         
         # Test Magento connection
         try:
-            magento_result = self.magento.test_connection()
+            magento_result = self.magento.check_connection()
             results['magento'] = {
                 'success': True,
                 'data': magento_result
@@ -501,7 +611,7 @@ class SyncPipeline:
         
         # Test Medusa connection
         try:
-            medusa_result = self.medusa.test_connection()
+            medusa_result = self.medusa.check_connection()
             results['medusa'] = {
                 'success': True,
                 'data': medusa_result
@@ -518,15 +628,11 @@ class SyncPipeline:
         
         return results
     
-    def _sync_categories(self, **kwargs) -> Dict[str, Any]:
+    def _sync_categories(self, batch_size: int = 100, dry_run: bool = False) -> Dict[str, Any]:
         """Sync categories"""
-        
-        batch_size = kwargs.get('batch_size', 100)
-        dry_run = kwargs.get('dry_run', False)
-        
         logger.info(f"Syncing categories (batch_size={batch_size}, dry_run={dry_run})")
         
-        service = CategorySyncService(self.magento, self.medusa)
+        service = self._get_service('categories', lambda: CategorySyncService(self.magento, self.medusa))
         
         if dry_run:
             logger.info("Dry run - would sync categories")
@@ -539,20 +645,19 @@ class SyncPipeline:
         
         return result
     
-    def _sync_products(self, **kwargs) -> Dict[str, Any]:
+    def _sync_products(self, batch_size: int = 50, max_pages: Optional[int] = None,
+                       dry_run: bool = False) -> Dict[str, Any]:
         """Sync products"""
-        from services.product_sync_service import ProductSyncService
-        
-        batch_size = kwargs.get('batch_size', 50)
-        max_pages = kwargs.get('max_pages')
-        dry_run = kwargs.get('dry_run', False)
         
         # Get category mapping from previous step
         category_mapping = self.results.get('category_mapping', {})
         
         logger.info(f"Syncing products (batch_size={batch_size}, dry_run={dry_run})")
         
-        service = ProductSyncService(self.magento, self.medusa, category_mapping)
+        service = self._get_service(
+            'products', lambda: ProductSyncService(self.magento, self.medusa, category_mapping)
+        )
+        service.category_mapping = category_mapping
         
         if dry_run:
             logger.info("Dry run - would sync products")
@@ -560,17 +665,13 @@ class SyncPipeline:
         
         return service.sync_all(batch_size=batch_size, max_pages=max_pages)
     
-    def _sync_customers(self, **kwargs) -> Dict[str, Any]:
+    def _sync_customers(self, batch_size: int = 100, max_pages: Optional[int] = None,
+                        dry_run: bool = False) -> Dict[str, Any]:
         """Sync customers"""
-        from services.customer_sync_service import CustomerSyncService
-        
-        batch_size = kwargs.get('batch_size', 100)
-        max_pages = kwargs.get('max_pages')
-        dry_run = kwargs.get('dry_run', False)
         
         logger.info(f"Syncing customers (batch_size={batch_size}, dry_run={dry_run})")
         
-        service = CustomerSyncService(self.magento, self.medusa)
+        service = self._get_service('customers', lambda: CustomerSyncService(self.magento, self.medusa))
         
         if dry_run:
             logger.info("Dry run - would sync customers")
@@ -578,18 +679,27 @@ class SyncPipeline:
         
         return service.sync_all(batch_size=batch_size, max_pages=max_pages)
     
-    def _process_dlq(self, **kwargs) -> Dict[str, Any]:
+    def _get_service(self, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return the sync service registered under name, building it with factory
+        on first use. Services share this pipeline's connectors (and so their
+        pooled HTTP sessions), and a retried step continues with the caches the
+        service already filled.
+        """
+        service = self._services.get(name)
+        if service is None:
+            service = self._services[name] = factory()
+        return service
+    
+    def _process_dlq(self, dry_run: bool = False) -> Dict[str, Any]:
         """Process items in Dead Letter Queue"""
-        dry_run = kwargs.get('dry_run', False)
-        
         logger.info("Processing DLQ items...")
         
         # Get DLQ counts
-        dlq_counts = {}
-        for entity in ['products', 'categories', 'customers', 'pipeline']:
-            dlq = DLQHandler(entity)
-            count = dlq.get_count()
-            dlq_counts[entity] = count
+        dlq_counts = {
+            entity: self._get_dlq(entity).get_count()
+            for entity in ('products', 'categories', 'customers', 'pipeline')
+        }
         
         total_dlq = sum(dlq_counts.values())
         
@@ -611,10 +721,15 @@ class SyncPipeline:
         
         return {'dlq_counts': dlq_counts, 'processed': 0}
     
-    def _generate_report(self, **kwargs) -> Dict[str, Any]:
+    def _get_dlq(self, entity: str) -> DLQHandler:
+        """DLQ handler for entity, created once per pipeline"""
+        dlq = self._dlq_handlers.get(entity)
+        if dlq is None:
+            dlq = self._dlq_handlers[entity] = DLQHandler(entity)
+        return dlq
+    
+    def _generate_report(self, dry_run: bool = False) -> Dict[str, Any]:
         """Generate sync report"""
-        dry_run = kwargs.get('dry_run', False)
-        
         logger.info("Generating sync report...")
         
         report = {
@@ -648,10 +763,8 @@ class SyncPipeline:
         
         # Save report to file
         if not dry_run:
-            import json
             report_file = f"sync_report_{self.pipeline_id}.json"
-            with open(report_file, 'w') as f:
-                json.dump(report, f, indent=2)
+            json_utils.dump_file(report, report_file, indent=False, default=str)
             
             logger.info(f"Report saved to {report_file}")
         
@@ -661,8 +774,7 @@ class SyncPipeline:
         
         logger.info(f"Resuming pipeline from {state_file}")
         
-        with open(state_file, 'r') as f:
-            state = json.load(f)
+        state = json_utils.load_file(state_file)
         
         # Restore pipeline state
         self.pipeline_id = state['pipeline_id']
@@ -681,9 +793,9 @@ class SyncPipeline:
         # Restore stats
         stats_data = state.get('stats', {})
         self.stats = PipelineStats()
-        for key, value in stats_data.items():
-            if hasattr(self.stats, key):
-                setattr(self.stats, key, value)
+        for f in fields(PipelineStats):
+            if f.init and f.name in stats_data:
+                setattr(self.stats, f.name, stats_data[f.name])
         
         logger.info(f"Pipeline state restored, resuming from step {len(self.results)}")
         
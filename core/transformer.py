@@ -4,6 +4,29 @@ import html
 from bs4 import BeautifulSoup
 from utils.logger import logger
 
+# Prefer the C-backed lxml tree builder for text extraction when it is installed
+try:
+    import lxml  # noqa: F401
+    _TEXT_PARSER = 'lxml'
+except ImportError:
+    _TEXT_PARSER = 'html.parser'
+
+_SLUG_SEPARATORS = re.compile(r'[\s_]+')
+_SLUG_INVALID = re.compile(r'[^a-z0-9\-]')
+_SLUG_DASHES = re.compile(r'\-+')
+_SKU_WHITESPACE = re.compile(r'\s+')
+_SKU_INVALID = re.compile(r'[^a-zA-Z0-9\-_]')
+
+# Line boundaries (as str.splitlines sees them) and runs of 2+ spaces, where
+# html_to_text breaks extracted text into separate lines
+_TEXT_BREAKS = re.compile(r'[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]| {2,}')
+
+# Strings to_boolean treats as True
+_TRUTHY = frozenset(['true', 'yes', '1', 'y', 'on'])
+
+# Tags clean_html keeps; everything else is unwrapped to its contents
+_CLEAN_HTML_TAGS = frozenset(['p', 'br', 'b', 'strong', 'i', 'em', 'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4'])
+
 
 class Transformer:
     """Data transformation utilities"""
@@ -25,13 +48,13 @@ class Transformer:
         text = text.lower().strip()
         
         # Replace spaces and underscores with hyphens
-        text = re.sub(r'[\s_]+', '-', text)
+        text = _SLUG_SEPARATORS.sub('-', text)
         
         # Remove special characters, keep only alphanumeric and hyphens
-        text = re.sub(r'[^a-z0-9\-]', '', text)
+        text = _SLUG_INVALID.sub('', text)
         
         # Remove consecutive hyphens
-        text = re.sub(r'\-+', '-', text)
+        text = _SLUG_DASHES.sub('-', text)
         
         return text
     
@@ -55,21 +78,21 @@ class Transformer:
             # Decode HTML entities
             text = html.unescape(html_content)
             
-            # Use BeautifulSoup to extract text
-            soup = BeautifulSoup(text, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            # Plain-text descriptions have nothing for a parser to do
+            if '<' in text or '&' in text:
+                # Use BeautifulSoup to extract text
+                soup = BeautifulSoup(text, _TEXT_PARSER)
                 
-            # Get text
-            text = soup.get_text()
+                # Remove script and style elements
+                for script in soup(["script", "style"]):
+                    script.decompose()
+                    
+                # Get text
+                text = soup.get_text()
             
-            # Break into lines and remove leading/trailing space on each
-            lines = (line.strip() for line in text.splitlines())
-            # Break multi-headlines into a line each
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            # Drop blank lines
+            # Break lines and multi-headlines into a line each, stripped,
+            # dropping blank ones
+            chunks = (chunk.strip() for chunk in _TEXT_BREAKS.split(text))
             text = '\n'.join(chunk for chunk in chunks if chunk)
             
             return text
@@ -81,13 +104,15 @@ class Transformer:
         if not html_content:
             return ""
         
+        # Without markup characters the parser would hand the text back unchanged
+        if not any(char in html_content for char in '<>&'):
+            return html_content
+        
         try:
-            allowed_tags = ['p', 'br', 'b', 'strong', 'i', 'em', 'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4']
             soup = BeautifulSoup(html_content, 'html.parser')
             
-            for tag in soup.find_all(True):
-                if tag.name not in allowed_tags:
-                    tag.unwrap() 
+            for tag in soup.find_all(lambda tag: tag.name not in _CLEAN_HTML_TAGS):
+                tag.unwrap()
             
             return str(soup)
         except Exception:
@@ -102,7 +127,7 @@ class Transformer:
             return bool(value)
         if isinstance(value, str):
             value_lower = value.lower().strip()
-            return value_lower in ('true', 'yes', '1', 'y', 'on')
+            return value_lower in _TRUTHY
         return False
     
     @staticmethod
@@ -153,10 +178,10 @@ class Transformer:
         sku = sku.strip()
         
         # Replace multiple spaces with single space
-        sku = re.sub(r'\s+', ' ', sku)
+        sku = _SKU_WHITESPACE.sub(' ', sku)
         
         # Remove special characters except alphanumeric, dash, underscore
-        sku = re.sub(r'[^a-zA-Z0-9\-_]', '', sku)
+        sku = _SKU_INVALID.sub('', sku)
         
         return sku
     
@@ -1,7 +1,17 @@
 from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
 import re
 from utils.logger import logger
 
+SKU_INVALID_CHARS = re.compile(r'[^\w\-\.]')
+URL_PATTERN = re.compile(
+    r'^(?:http|ftp)s?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
 
 class ValidationError(Exception):
     """Custom exception for validation errors"""
@@ -122,16 +132,8 @@ class Validator:
         """Validate SKU format"""
         if not sku:
             return False, "SKU cannot be empty"
-            
-        # Check length
-        if len(sku) > 64:
-            return False, f"SKU too long: {len(sku)} characters (max 64)"
-            
-        # Check for invalid characters
-        if re.search(r'[^\w\-\.]', sku):
-            return False, "SKU contains invalid characters"
-            
-        return True, ""
+        # the same SKUs come back on retries, resumes and DLQ reprocessing
+        return _check_sku(sku)
     
     def validate_price(self, price: Any) -> Tuple[bool, str]:
         """Validate price"""
@@ -150,15 +152,7 @@ class Validator:
         if not url:
             return True
             
-        url_pattern = re.compile(
-            r'^(?:http|ftp)s?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-            
-        if not re.match(url_pattern, url):
+        if not _url_matches(url):
             self.warnings.append({
                 'type': 'invalid_url',
                 'field': 'url',
@@ -181,4 +175,22 @@ class Validator:
     
     def is_valid(self) -> bool:
         """Check if validation passed without errors"""
-        return len(self.errors) == 0
\ No newline at end of file
+        return len(self.errors) == 0
+
+
+@lru_cache(maxsize=4096)
+def _check_sku(sku: str) -> Tuple[bool, str]:
+    # Check length
+    if len(sku) > 64:
+        return False, f"SKU too long: {len(sku)} characters (max 64)"
+        
+    # Check for invalid characters
+    if SKU_INVALID_CHARS.search(sku):
+        return False, "SKU contains invalid characters"
+        
+    return True, ""
+
+
+@lru_cache(maxsize=4096)
+def _url_matches(url: str) -> bool:
+    return URL_PATTERN.match(url) is not None
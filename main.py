@@ -4,9 +4,6 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any
 
-# Add parent directory to path
-sys.path.append(str(Path(__file__).parent.parent))
-
 from utils.logger import setup_logger, logger
 from connectors.magento.magento_connector import MagentoConnector
 from connectors.medusa.medusa_connector import MedusaConnector
@@ -19,6 +16,8 @@ from core.pipeline.pipeline import create_pipeline
 
 import subprocess
 
+CLI_SCRIPT = Path(__file__).resolve().parent / "cli.py"
+
 
 # Configure logging
 logger = setup_logger()
@@ -552,22 +551,17 @@ def view_dlq():
             # Show recent failed items
             for entity in entities:
                 dlq = DLQHandler(entity)
-                pattern = f"{entity}_*.json"
-                dlq_dir = Path("dlq")
-                files = list(dlq_dir.glob(pattern))
-                if files:
-                    latest_file = max(files, key=lambda p: p.stat().st_mtime)
-                    try:
-                        with open(latest_file, 'r') as f:
-                            items = json.load(f)
-                            print(f"\nRecent {entity} failures:")
-                            for i, item in enumerate(items[:3], 1):
-                                error = item.get('error', 'Unknown error')
-                                sku = item.get('source_data', {}).get('sku', 'N/A')
-                                print(f"  {i}. SKU: {sku}")
-                                print(f"     Error: {error[:100]}...")
-                    except Exception as e:
-                        print(f"  Error reading {entity} DLQ: {e}")
+                try:
+                    items = dlq.recent_items(3)
+                    if items:
+                        print(f"\nRecent {entity} failures:")
+                        for i, item in enumerate(items, 1):
+                            error = item.get('error', 'Unknown error')
+                            sku = item.get('source_data', {}).get('sku', 'N/A')
+                            print(f"  {i}. SKU: {sku}")
+                            print(f"     Error: {error[:100]}...")
+                except Exception as e:
+                    print(f"  Error reading {entity} DLQ: {e}")
         
         elif choice == '2':
             export_dlq_to_csv_interactive()
@@ -791,7 +785,7 @@ def launch_cli_mode():
     print("-" * 50)
         
     # Run CLI with --help first
-    subprocess.run([sys.executable, "connectors/cli.py", "--help"])
+    subprocess.run([sys.executable, str(CLI_SCRIPT), "--help"])
     
     print("\nEnter CLI commands (or 'exit' to return):")
     
@@ -809,7 +803,7 @@ def launch_cli_mode():
                 
                 # Run CLI command
                 result = subprocess.run(
-                    [sys.executable, "connectors/cli.py"] + args,
+                    [sys.executable, str(CLI_SCRIPT)] + args,
                     capture_output=True,
                     text=True
                 )
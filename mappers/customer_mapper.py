@@ -221,6 +221,9 @@ class CustomerMapper(BaseMapper):
         # Clean phone number if exists
         if phone := customer_data.get('phone'):
             customer_data['phone'] = self._clean_phone_number(phone)
+
+        # Passwords are never sent to Medusa; customers get an invite instead
+        customer_data.pop('password', None)
     
     def _validate_output_format(self, customer_data: Dict):
         """Validate mapped output format against Medusa requirements"""
@@ -23,15 +23,17 @@ def html_to_text(html_content: str, max_length: Optional[int] = None) -> str:
         # Decode HTML entities
         text = html.unescape(html_content)
         
-        # Use BeautifulSoup for HTML parsing
-        soup = BeautifulSoup(text, 'html.parser')
-        
-        # Remove unwanted tags
-        for element in soup(['script', 'style', 'head', 'title', 'meta', '[document]']):
-            element.decompose()
-        
-        # Get text
-        text = soup.get_text(separator=' ', strip=True)
+        # Plain-text values (most short attributes) have nothing to parse
+        if '<' in text or '&' in text:
+            # Use BeautifulSoup for HTML parsing
+            soup = BeautifulSoup(text, 'html.parser')
+            
+            # Remove unwanted tags
+            for element in soup(['script', 'style', 'head', 'title', 'meta', '[document]']):
+                element.decompose()
+            
+            # Get text
+            text = soup.get_text(separator=' ', strip=True)
         
         # Clean up whitespace
         text = re.sub(r'\s+', ' ', text)
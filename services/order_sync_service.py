@@ -3,9 +3,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from decimal import Decimal
 from contextlib import contextmanager
-import json
 from pathlib import Path
 from utils.logger import logger
+from utils import json_utils
 from mappers.order_mapper import OrderMapper
 from core.dlq_handler import DLQHandler
 from connectors.magento.magento_connector import MagentoConnector
@@ -341,8 +341,7 @@ class OrderSyncService:
             
             mapping_file = Path('mappings/customer_id_mapping.json')
             if mapping_file.exists():
-                with open(mapping_file, 'r') as f:
-                    return json.load(f)
+                return json_utils.load_file(mapping_file)
             
         except Exception as e:
             logger.warning(f"Failed to load customer mapping: {e}")
@@ -351,13 +350,9 @@ class OrderSyncService:
     
     def _load_product_mapping(self) -> Dict[str, str]:
         try:
-            import json
-            from pathlib import Path
-            
             mapping_file = Path('mappings/product_id_mapping.json')
             if mapping_file.exists():
-                with open(mapping_file, 'r') as f:
-                    return json.load(f)
+                return json_utils.load_file(mapping_file)
                     
         except Exception as e:
             logger.warning(f"Failed to load product mapping: {e}")
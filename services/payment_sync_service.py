@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from utils.logger import logger
 from mappers.invoice_mapper import InvoiceMapper
@@ -45,14 +45,35 @@ class PaymentSyncService:
                 if not magento_invoices:
                     continue
                     
-                # 2. Process từng invoice
+                context = {
+                    'order_id_mapping': order_mapping,
+                    'product_id_mapping': self._load_product_mapping(),
+                    'operation': 'create_invoice'
+                }
+                
+                # 2. Map từng invoice, collecting the ones to create
+                pending = []
                 for magento_invoice in magento_invoices:
-                    invoice_result = self._sync_single_invoice(
+                    invoice_data, invoice_result = self._prepare_invoice(
                         magento_invoice, 
                         medusa_order_id,
-                        order_mapping
+                        context
                     )
-                    results.append(invoice_result)
+                    if invoice_data:
+                        pending.append((magento_invoice, invoice_data))
+                    else:
+                        results.append(invoice_result)
+                        
+                # 3. Create the new invoices in one batch, then their payments
+                if pending:
+                    created = self.medusa.create_invoices_bulk([data for _, data in pending])
+                    for (magento_invoice, invoice_data), (_, created_invoice, error) in zip(pending, created):
+                        if error:
+                            results.append(self._invoice_failed(magento_invoice, medusa_order_id, error))
+                            continue
+                        results.append(self._finish_invoice(
+                            magento_invoice, invoice_data, created_invoice, medusa_order_id, context
+                        ))
                     
             except Exception as e:
                 logger.error(f"Failed to sync invoices for order {magento_order_id}: {e}")
@@ -64,28 +85,24 @@ class PaymentSyncService:
             'results': results
         }
     
-    def _sync_single_invoice(self, magento_invoice: Dict, 
-                            medusa_order_id: str,
-                            order_mapping: Dict) -> Dict:
-        
+    def _prepare_invoice(self, magento_invoice: Dict, 
+                         medusa_order_id: str,
+                         context: Dict) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Map an invoice. Returns (payload, None) if it still has to be created
+        in Medusa, otherwise (None, result) for a skipped or failed invoice.
+        """
         invoice_number = magento_invoice.get('increment_id', 'unknown')
         logger.info(f"Syncing invoice {invoice_number}")
         
         try:
-            # 1. Prepare context
-            context = {
-                'order_id_mapping': order_mapping,
-                'product_id_mapping': self._load_product_mapping(),
-                'operation': 'create_invoice'
-            }
-            
-            # 2. Map invoice data
+            # 1. Map invoice data
             medusa_invoice_data = self.invoice_mapper.map(magento_invoice, context)
             
-            # 3. Ensure order_id is set
+            # 2. Ensure order_id is set
             medusa_invoice_data['order_id'] = medusa_order_id
             
-            # 4. Check if invoice already exists
+            # 3. Check if invoice already exists
             existing_invoice = self._find_existing_invoice(
                 invoice_number, 
                 medusa_order_id
@@ -93,12 +110,23 @@ class PaymentSyncService:
             
             if existing_invoice:
                 logger.info(f"Invoice {invoice_number} already exists, skipping")
-                return {'status': 'skipped', 'invoice_id': existing_invoice['id']}
-            
-            # 5. Create invoice in Medusa
-            created_invoice = self.medusa.create_invoice(medusa_invoice_data)
+                return None, {'status': 'skipped', 'invoice_id': existing_invoice['id']}
+                
+            return medusa_invoice_data, None
             
-            # 6. Sync payments liên quan đến invoice này
+        except Exception as e:
+            return None, self._invoice_failed(magento_invoice, medusa_order_id, e)
+    
+    def _finish_invoice(self, magento_invoice: Dict, 
+                        medusa_invoice_data: Dict,
+                        created_invoice: Dict,
+                        medusa_order_id: str,
+                        context: Dict) -> Dict:
+        """Sync the payments of a created invoice and record it"""
+        invoice_number = magento_invoice.get('increment_id', 'unknown')
+        
+        try:
+            # Sync payments liên quan đến invoice này
             self._sync_payments_for_invoice(magento_invoice, medusa_order_id, context)
             
             self.stats['invoices_processed'] += 1
@@ -112,19 +140,23 @@ class PaymentSyncService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to sync invoice {invoice_number}: {e}")
-            self.stats['failed'] += 1
-            
-            # Add to DLQ
-            self.dlq.add_item({
-                'entity_type': 'invoice',
-                'source_data': magento_invoice,
-                'error': str(e),
-                'order_id': medusa_order_id,
-                'timestamp': datetime.now().isoformat()
-            })
-            
-            return {'status': 'failed', 'error': str(e)}
+            return self._invoice_failed(magento_invoice, medusa_order_id, e)
+    
+    def _invoice_failed(self, magento_invoice: Dict, medusa_order_id: str, error: Exception) -> Dict:
+        invoice_number = magento_invoice.get('increment_id', 'unknown')
+        logger.error(f"Failed to sync invoice {invoice_number}: {error}")
+        self.stats['failed'] += 1
+        
+        # Add to DLQ
+        self.dlq.add_item({
+            'entity_type': 'invoice',
+            'source_data': magento_invoice,
+            'error': str(error),
+            'order_id': medusa_order_id,
+            'timestamp': datetime.now().isoformat()
+        })
+        
+        return {'status': 'failed', 'error': str(error)}
     
     def _sync_payments_for_invoice(self, magento_invoice: Dict, 
                                   medusa_order_id: str,
@@ -141,20 +173,33 @@ class PaymentSyncService:
             if not magento_payments:
                 return
                 
-            # 2. Process từng payment
+            # 2. Process từng payment, collecting the ones to create
+            pending = []
             for magento_payment in magento_payments:
-                self._process_payment(
+                payment_data = self._process_payment(
                     magento_payment, 
                     medusa_order_id,
                     context
                 )
+                if payment_data:
+                    pending.append((magento_payment.get('entity_id', 'unknown'), payment_data))
+                    
+            # 3. Create the new payments in one batch
+            if pending:
+                results = self.medusa.create_payments_bulk([data for _, data in pending])
+                for (payment_id, _), (_, _, error) in zip(pending, results):
+                    if error:
+                        logger.warning(f"Failed to process payment {payment_id}: {error}")
+                    else:
+                        self.stats['payments_processed'] += 1
                 
         except Exception as e:
             logger.warning(f"Failed to sync payments for invoice {invoice_id}: {e}")
     
     def _process_payment(self, magento_payment: Dict, 
                         medusa_order_id: str,
-                        context: Dict):
+                        context: Dict) -> Optional[Dict]:
+        """Map a payment; returns the payload if it still has to be created in Medusa"""
         
         payment_id = magento_payment.get('entity_id', 'unknown')
         logger.debug(f"Processing payment {payment_id}")
@@ -180,7 +225,7 @@ class PaymentSyncService:
                 )
                 
                 if not existing_payment:
-                    self.medusa.create_payment(medusa_payment_data)
+                    return medusa_payment_data
                     
             self.stats['payments_processed'] += 1
             
@@ -98,34 +98,24 @@ class ProductSyncService:
         try:
             logger.info("Loading existing products from Medusa...")
             
-            page = 1
             page_size = 100
             total_loaded = 0
             
-            while True:
-                products = self.medusa.get_products(page=page, page_size=page_size)
-                
-                if not products:
-                    break
-                
-                for product in products:
-                    sku = product.get('sku')
-                    if sku:
-                        self.existing_products[sku] = product['id']
-                        
-                        # Also cache variants
-                        for variant in product.get('variants', []):
-                            variant_sku = variant.get('sku')
-                            if variant_sku:
-                                self.existing_products[variant_sku] = product['id']
-                
-                total_loaded += len(products)
-                logger.info(f"Loaded {total_loaded} existing products...")
-                
-                if len(products) < page_size:
-                    break
+            # pages are prefetched concurrently, products arrive in page order
+            for product in self.medusa.iter_products(page_size=page_size):
+                sku = product.get('sku')
+                if sku:
+                    self.existing_products[sku] = product['id']
                     
-                page += 1
+                    # Also cache variants
+                    for variant in product.get('variants', []):
+                        variant_sku = variant.get('sku')
+                        if variant_sku:
+                            self.existing_products[variant_sku] = product['id']
+                
+                total_loaded += 1
+                if total_loaded % page_size == 0:
+                    logger.info(f"Loaded {total_loaded} existing products...")
                 
             logger.info(f"Loaded {len(self.existing_products)} existing products/variants from Medusa")
             
@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from utils.logger import logger
+from utils.yaml_loader import YamlLoader, YamlDumper
 
 
 def load_config(config_file: str) -> Dict[str, Any]:
@@ -15,7 +16,7 @@ def load_config(config_file: str) -> Dict[str, Any]:
     
     with open(path, 'r', encoding='utf-8') as f:
         if path.suffix.lower() in ['.yaml', '.yml']:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=YamlLoader)
         elif path.suffix.lower() == '.json':
             return json.load(f)
         else:
@@ -25,7 +26,7 @@ def load_config(config_file: str) -> Dict[str, Any]:
                 return json.loads(content)
             except json.JSONDecodeError:
                 try:
-                    return yaml.safe_load(content)
+                    return yaml.load(content, Loader=YamlLoader)
                 except yaml.YAMLError:
                     raise ValueError(f"Unsupported config file format: {config_file}")
 
@@ -36,7 +37,7 @@ def save_config(config: Dict[str, Any], config_file: str):
     
     with open(path, 'w', encoding='utf-8') as f:
         if path.suffix.lower() in ['.yaml', '.yml']:
-            yaml.dump(config, f, default_flow_style=False)
+            yaml.dump(config, f, Dumper=YamlDumper, default_flow_style=False)
         elif path.suffix.lower() == '.json':
             json.dump(config, f, indent=2)
         else:
@@ -0,0 +1,28 @@
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+import orjson
+
+# Results and mappings may be keyed by Magento integer IDs
+_BASE_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+    """Serialize to UTF-8 JSON bytes"""
+    option = _BASE_OPTIONS | orjson.OPT_INDENT_2 if indent else _BASE_OPTIONS
+    return orjson.dumps(obj, default=default, option=option)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str"""
+    return orjson.loads(data)
+
+
+def dump_file(obj: Any, path: Union[str, Path], indent: bool = True, default: Optional[Callable] = None):
+    """Write obj as JSON to path"""
+    with open(path, 'wb') as f:
+        f.write(dumps(obj, indent=indent, default=default))
+
+
+def load_file(path: Union[str, Path]) -> Any:
+    """Read JSON from path"""
+    return orjson.loads(Path(path).read_bytes())
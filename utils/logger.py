@@ -2,7 +2,7 @@ import logging
 import sys
 from pathlib import Path
 from datetime import datetime
-import os
+from config.settings import get_env
 
 
 def setup_logger(name: str = "magento_medusa_sync", log_level: str = None):
@@ -13,9 +13,9 @@ def setup_logger(name: str = "magento_medusa_sync", log_level: str = None):
         name: Logger name
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
-    # Get log level from environment or use default
+    # Get log level from the settings (.env included) or use default
     if log_level is None:
-        log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+        log_level = get_env('LOG_LEVEL', 'INFO').upper()
     
     # Create logs directory
     log_dir = Path("logs")